@@ -1,13 +1,62 @@
 # apprenticeship/admin.py
 
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Trim
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 
 from apprenticeship.models import ApprenticeshipVacancy, ApprenticeshipScrapeLog
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Unfiltered changelists on Postgres use the planner's row estimate
+    (pg_class.reltuples) instead of a full COUNT(*). Filtered/searched lists
+    and other backends fall back to the exact count.
+    """
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        conn = connections[qs.db]
+        if conn.vendor == "postgresql" and not qs.query.where:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [qs.model._meta.db_table],
+                )
+                row = cur.fetchone()
+            # reltuples is -1/0 until the table has been vacuumed/analyzed
+            if row and row[0] > 0:
+                return int(row[0])
+        return super().count
+
+
+class EstimatedCountAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+def _image_url(obj: ApprenticeshipVacancy) -> str:
+    # `_img` is annotated by ApprenticeshipVacancyAdmin.get_queryset; unsaved
+    # instances (add form) don't carry it.
+    url = getattr(obj, "_img", None)
+    if url is None:
+        url = (getattr(obj, "image_url", "") or "").strip()
+    return url
+
+
 @admin.register(ApprenticeshipVacancy)
 class ApprenticeshipVacancyAdmin(admin.ModelAdmin):
+    # no FKs on this model; keep the changelist to a single query per page
+    list_select_related = ()
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False
+
     list_display = (
         "vacancy_ref",
         "title",
@@ -15,8 +64,7 @@ class ApprenticeshipVacancyAdmin(admin.ModelAdmin):
         "location_summary",
         "category",
         "subcategory",
-        "image_open_link",
-        "image_preview_thumb",
+        "image_cell",
         "last_checked_at",
         "last_scrape_status",
         "scraped_at",
@@ -38,22 +86,14 @@ class ApprenticeshipVacancyAdmin(admin.ModelAdmin):
         "latitude",
         "longitude",
     )
+    # "=" exact / "^" prefix so admin search can use indexes instead of a 15-way ILIKE '%q%'
     search_fields = (
-        "vacancy_ref",
-        "title",
-        "employer_name",
-        "location_summary",
+        "=vacancy_ref",
+        "^title",
+        "^employer_name",
+        "^location_summary",
         "category",
         "subcategory",
-        "training_course",
-        "training_provider",
-        "image_url",
-        "requirement_summery",
-        "city",
-        "state",
-        "zip_code",
-        "latitude",
-        "longitude",
     )
     readonly_fields = (
         "scraped_at",
@@ -154,26 +194,24 @@ class ApprenticeshipVacancyAdmin(admin.ModelAdmin):
         ),
     )
 
-    @admin.display(description="Image")
-    def image_open_link(self, obj: ApprenticeshipVacancy):
-        url = (getattr(obj, "image_url", "") or "").strip()
-        if not url:
-            return "-"
-        return format_html('<a href="{}" target="_blank" rel="noopener">open</a>', url)
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_img=Trim(Coalesce("image_url", Value(""))))
 
-    @admin.display(description="Preview")
-    def image_preview_thumb(self, obj: ApprenticeshipVacancy):
-        url = (getattr(obj, "image_url", "") or "").strip()
+    @admin.display(description="Image")
+    def image_cell(self, obj: ApprenticeshipVacancy):
+        url = _image_url(obj)
         if not url:
             return "-"
         return format_html(
-            '<img src="{}" style="height:40px;width:40px;object-fit:cover;border-radius:6px;border:1px solid #ddd;" />',
+            '<a href="{0}" target="_blank" rel="noopener">'
+            '<img src="{0}" style="height:40px;width:40px;object-fit:cover;border-radius:6px;border:1px solid #ddd;" />'
+            "</a>",
             url,
         )
 
     @admin.display(description="Preview")
     def image_preview_large(self, obj: ApprenticeshipVacancy):
-        url = (getattr(obj, "image_url", "") or "").strip()
+        url = _image_url(obj)
         if not url:
             return "No image_url"
         return format_html(
@@ -185,7 +223,7 @@ class ApprenticeshipVacancyAdmin(admin.ModelAdmin):
 
 
 @admin.register(ApprenticeshipScrapeLog)
-class ApprenticeshipScrapeLogAdmin(admin.ModelAdmin):
+class ApprenticeshipScrapeLogAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         "created_at",
         "status",
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from apprenticeship.models import ApprenticeshipImageCache, ApprenticeshipVacancy
+from apprenticeship.services.image_job import (
+    build_apprenticeship_prompt,
+    generate_apprenticeship_image_and_upload,
+    prompt_hash,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate + upload images for ApprenticeshipVacancy rows that have no image_url yet "
+        "(reads the worklist through the vac_no_image_idx partial index)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0, help="Process only N rows (0=all).")
+        parser.add_argument("--workers", type=int, default=4, help="Images generated/uploaded concurrently.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Rows fetched per DB round trip.")
+
+    def handle(self, *args, **opts):
+        limit = int(opts["limit"])
+        workers = max(1, int(opts["workers"]))
+
+        qs = (
+            ApprenticeshipVacancy.objects.filter(image_url="")
+            .order_by()
+            .values_list("vacancy_ref", "title", "employer_name")
+        )
+        if limit:
+            qs = qs[:limit]
+
+        done = failed = cached = skipped = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # one generation per distinct prompt; every vacancy sharing it gets the same URL
+            by_key: dict[str, Future] = {}
+            futures: dict[Future, tuple[str, list[str]]] = {}
+            for vacancy_ref, title, employer_name in qs.iterator(chunk_size=int(opts["chunk_size"])):
+                # same inputs as scrape_apprenticeship: no title, no prompt worth generating
+                title = (title or "").strip()
+                employer_name = (employer_name or "").strip()
+                if not title:
+                    skipped += 1
+                    continue
+                key = prompt_hash(build_apprenticeship_prompt(title, employer_name))
+                fut = by_key.get(key)
+                if fut is not None:
+                    futures[fut][1].append(vacancy_ref)
+                    continue
+
+                cloud_url = ApprenticeshipImageCache.objects.filter(prompt_hash=key).values_list(
+                    "cloud_url", flat=True
+                ).first()
+                if cloud_url:
+                    ApprenticeshipVacancy.objects.filter(vacancy_ref=vacancy_ref, image_url="").update(image_url=cloud_url)
+                    cached += 1
+                    self.stdout.write(f"{vacancy_ref}: {cloud_url} (cached)")
+                    continue
+
+                fut = pool.submit(
+                    generate_apprenticeship_image_and_upload,
+                    vacancy_ref=vacancy_ref,
+                    title=title,
+                    employer_name=employer_name,
+                    # shared through ApprenticeshipImageCache, so keyed by prompt, not vacancy
+                    public_id=f"p_{key}",
+                )
+                by_key[key] = fut
+                futures[fut] = (key, [vacancy_ref])
+
+            # DB writes stay on this thread
+            for fut in as_completed(futures):
+                key, vacancy_refs = futures[fut]
+                try:
+                    cloud_url, _prompt_used = fut.result()
+                except Exception as e:
+                    failed += len(vacancy_refs)
+                    self.stdout.write(self.style.WARNING(f"{', '.join(vacancy_refs)}: image failed: {e}"))
+                    continue
+                ApprenticeshipImageCache.objects.update_or_create(prompt_hash=key, defaults={"cloud_url": cloud_url})
+                for vacancy_ref in vacancy_refs:
+                    # image_url="" guard: a concurrent scrape may have filled it already
+                    ApprenticeshipVacancy.objects.filter(vacancy_ref=vacancy_ref, image_url="").update(image_url=cloud_url)
+                    done += 1
+                    self.stdout.write(f"{vacancy_ref}: {cloud_url}")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. uploaded={done}, cached={cached}, skipped={skipped}, failed={failed}"))
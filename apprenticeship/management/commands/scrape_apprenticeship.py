@@ -1,21 +1,41 @@
 from __future__ import annotations
 
+import csv
+import functools
+import hashlib
+import io
 import json
+import operator
+import random
+import sys
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import urlencode
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from django.utils import timezone
 
-from apprenticeship.models import ApprenticeshipVacancy, ApprenticeshipScrapeLog
+from apprenticeship.models import ApprenticeshipImageCache, ApprenticeshipVacancy, ApprenticeshipScrapeLog
 from apprenticeship.scrapper.ncs import NcsApprenticeshipClient
-from apprenticeship.services.image_job import generate_apprenticeship_image_and_upload
+from apprenticeship.services.image_job import (
+    build_apprenticeship_prompt,
+    generate_apprenticeship_image_and_upload,
+    prompt_hash,
+)
 
 BASE_SEARCH_URL = "https://www.findapprenticeship.service.gov.uk/apprenticeships"
 
+# ApprenticeshipScrapeLog rows are buffered and written in one COPY (Postgres)
+# or bulk_create instead of one INSERT per vacancy.
+LOG_BATCH_SIZE = 500
+LOG_COPY_COLUMNS = ("run_id", "created_at", "category", "keyword", "start_url", "vacancy_ref", "status", "message")
+
 
 def _categories_json_path() -> Path:
     return Path(settings.BASE_DIR) / "apprenticeship" / "categories" / "categories.json"
@@ -25,7 +45,13 @@ def _load_categories_file(path: Path) -> dict[str, list[str]]:
     if not path.exists():
         raise FileNotFoundError(f"categories.json not found at: {path}")
 
-    data = json.loads(path.read_text(encoding="utf-8"))
+    # keyed on mtime so an edited file is re-read; callers must not mutate the result
+    return _load_categories_cached(str(path), path.stat().st_mtime)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_categories_cached(path_str: str, mtime: float) -> dict[str, list[str]]:
+    data = json.loads(Path(path_str).read_text(encoding="utf-8"))
     if not isinstance(data, dict):
         raise ValueError(
             "categories.json must be a JSON object like: "
@@ -39,8 +65,8 @@ def _load_categories_file(path: Path) -> dict[str, list[str]]:
         if not isinstance(subcats, list) or not all(isinstance(x, str) for x in subcats):
             raise ValueError(f'Value for category "{category}" must be a list of strings')
 
-        clean_category = category.strip()
-        clean_subcats = [s.strip() for s in subcats if s and s.strip()]
+        clean_category = sys.intern(category.strip())
+        clean_subcats = [sys.intern(s.strip()) for s in subcats if s and s.strip()]
         if clean_subcats:
             out[clean_category] = clean_subcats
 
@@ -55,6 +81,20 @@ def _build_search_url(subcategory: str) -> str:
     return f"{BASE_SEARCH_URL}?{qs}"
 
 
+def _parse_shard(value: str) -> tuple[int, int]:
+    """'2/4' -> (2, 4); empty -> (0, 1), i.e. the whole work list."""
+    value = (value or "").strip()
+    if not value:
+        return 0, 1
+    try:
+        index, count = (int(x) for x in value.split("/", 1))
+    except ValueError:
+        raise CommandError(f"--shard must look like INDEX/COUNT (e.g. 0/4), got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise CommandError(f"--shard index must be in [0, COUNT), got {value!r}")
+    return index, count
+
+
 def _is_acronym_search_term(term: str) -> bool:
     """Bare short acronyms (AI, ML, DL) are poor *search* queries (flood with
     retAIl/trAIning/etc). Kept in the keyword file for post-scrape filtering, but
@@ -63,21 +103,81 @@ def _is_acronym_search_term(term: str) -> bool:
     return len(t) <= 3 and t.isupper()
 
 
+_EMPTYISH = frozenset({
+    "",
+    "-",
+    "—",
+    "n/a",
+    "na",
+    "not available",
+    "not applicable",
+    "tbc",
+    "to be confirmed",
+    "competitive",
+})
+
+
+# detail-page fields that fall back to the listing card value when missing
+_FALLBACK_FIELDS = (
+    "title",
+    "employer_name",
+    "location_summary",
+    "closing_text",
+    "posted_text",
+    "start_date",
+    "training_course",
+    "wage",
+)
+
+
 def _is_emptyish(val: str) -> bool:
-    v = (val or "").strip().lower()
-    if not v:
-        return True
-    return v in {
-        "-",
-        "—",
-        "n/a",
-        "na",
-        "not available",
-        "not applicable",
-        "tbc",
-        "to be confirmed",
-        "competitive",
-    }
+    return (val or "").strip().lower() in _EMPTYISH
+
+
+# Scraped columns compared against the DB row in _upsert_smart (category and
+# subcategory are optional per call and compared separately).
+_DIFF_FIELDS = (
+    "vacancy_url",
+    "title",
+    "employer_name",
+    "location_summary",
+    "closing_text",
+    "posted_text",
+    "summary_text",
+    "wage",
+    "wage_extra",
+    "training_course",
+    "hours",
+    "hours_per_week",
+    "start_date",
+    "duration",
+    "positions_available",
+    "work_intro",
+    "what_youll_do_heading",
+    "what_youll_do_items",
+    "where_youll_work_name",
+    "where_youll_work_address",
+    "training_intro",
+    "training_provider",
+    "training_course_repeat",
+    "what_youll_learn_items",
+    "training_schedule",
+    "more_training_information",
+    "essential_qualifications",
+    "skills_items",
+    "other_requirements_items",
+    "about_employer",
+    "employer_website",
+    "company_benefits_items",
+    "after_this_apprenticeship",
+    "contact_name",
+)
+_DIFF_GETTER = operator.itemgetter(*_DIFF_FIELDS)
+
+
+def _content_hash(vals: dict) -> str:
+    payload = json.dumps(vals, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
 def _model_field_names(model) -> set[str]:
@@ -92,7 +192,12 @@ class Command(BaseCommand):
     )
 
     def add_arguments(self, parser):
-        parser.add_argument("--delay", type=float, default=0.7)
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.7,
+            help="Minimum seconds between request starts, shared by all --workers.",
+        )
         parser.add_argument(
             "--max-rows",
             type=int,
@@ -122,18 +227,135 @@ class Command(BaseCommand):
             action="store_true",
             help="Regenerate and overwrite apprenticeship image even if image_url already exists.",
         )
+        parser.add_argument(
+            "--skip-if-checked-within-hours",
+            type=int,
+            default=0,
+            help="Skip the detail fetch for vacancies checked within the last N hours (0=off).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Vacancy detail pages fetched concurrently (DB writes stay on the main thread).",
+        )
+        parser.add_argument(
+            "--image-workers",
+            type=int,
+            default=4,
+            help="Images generated/uploaded in the background while scraping continues.",
+        )
+        parser.add_argument(
+            "--shuffle",
+            action="store_true",
+            help="Visit subcategories in random order instead of categories.json order (not with --start-url).",
+        )
+        parser.add_argument(
+            "--shard",
+            type=str,
+            default="",
+            help="Only scrape every COUNT-th subcategory starting at INDEX, e.g. 0/4 .. 3/4 for four machines "
+                 "(not with --start-url).",
+        )
+        parser.add_argument(
+            "--http-cache",
+            type=str,
+            default="",
+            help="Optional: sqlite file caching parsed vacancy pages between runs; "
+                 "unchanged pages are revalidated (ETag/Last-Modified) instead of re-downloaded.",
+        )
 
     def handle(self, *args, **opts):
-        client = NcsApprenticeshipClient(delay=float(opts["delay"]))
         max_rows = int(opts["max_rows"])
         start_url_override = str(opts["start_url"]).strip()
 
+        # bad options fail here, before any output or I/O
+        shard = _parse_shard(opts.get("shard") or "")
+        if start_url_override and (opts.get("shard") or opts.get("shuffle")):
+            raise CommandError(
+                "--shard and --shuffle split the categories.json work list; they can't be used with --start-url"
+            )
+
         no_images = bool(opts.get("no_images"))
         refresh_images = bool(opts.get("refresh_images"))
 
         run_id = uuid.uuid4()
         self.stdout.write(self.style.WARNING(f"run_id={run_id}"))
 
+        self._log_buffer: list[ApprenticeshipScrapeLog] = []
+        # one timestamp per log batch, shared by the rows' last_checked_at and log created_at
+        self._batch_now = timezone.now()
+        self._workers = max(1, int(opts.get("workers") or 1))
+        # +1 connection for the listing pages fetched on the main thread
+        client = NcsApprenticeshipClient(
+            delay=float(opts["delay"]),
+            pool_size=self._workers + 1,
+            cache_path=str(opts.get("http_cache") or "").strip(),
+        )
+        self._pool = ThreadPoolExecutor(max_workers=self._workers)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, int(opts.get("image_workers") or 1)))
+        self._image_jobs: list[tuple[Future, dict]] = []
+        # prompt hash -> uploaded URL ("" = not cached), and generations still running,
+        # so vacancies with the same title + employer share one Gemini call
+        self._image_urls: dict[str, str] = {}
+        self._image_inflight: dict[str, Future] = {}
+        try:
+            self._run(
+                client=client,
+                opts=opts,
+                run_id=run_id,
+                max_rows=max_rows,
+                start_url_override=start_url_override,
+                shard=shard,
+                no_images=no_images,
+                refresh_images=refresh_images,
+            )
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            # normal runs have already drained; this only matters on an aborted run
+            self._image_pool.shutdown(wait=True, cancel_futures=True)
+            self._drain_images(wait=True)
+            self._flush_logs()
+            client.close()
+
+    def _prefetch_details(
+        self,
+        client: NcsApprenticeshipClient,
+        listings: Iterable,
+        seen_refs: set[str],
+    ) -> Iterator[tuple[object, Future]]:
+        """
+        Yield (listed, details_future) in listing order while keeping up to
+        --workers detail pages in flight. Only HTTP + parsing run in the pool.
+        """
+        pending: deque[tuple[object, Future]] = deque()
+        try:
+            for listed in listings:
+                if listed.vacancy_ref in seen_refs:
+                    continue
+                seen_refs.add(listed.vacancy_ref)
+                pending.append((listed, self._pool.submit(client.scrape_vacancy_detail, listed.url)))
+                if len(pending) >= self._workers:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            # consumer stopped early (--max-rows): drop fetches nobody will read
+            for _, fut in pending:
+                fut.cancel()
+
+    def _run(
+        self,
+        *,
+        client: NcsApprenticeshipClient,
+        opts: dict,
+        run_id,
+        max_rows: int,
+        start_url_override: str,
+        shard: tuple[int, int],
+        no_images: bool,
+        refresh_images: bool,
+    ) -> None:
         created_count = 0
         updated_count = 0
         skipped_count = 0
@@ -141,6 +363,17 @@ class Command(BaseCommand):
 
         seen_refs: set[str] = set()
 
+        recent_hours = int(opts.get("skip_if_checked_within_hours") or 0)
+        if recent_hours > 0:
+            seen_refs.update(
+                ApprenticeshipVacancy.objects.filter(
+                    last_checked_at__gte=timezone.now() - timedelta(hours=recent_hours)
+                ).values_list("vacancy_ref", flat=True)
+            )
+            self.stdout.write(
+                self.style.WARNING(f"Skipping {len(seen_refs)} vacancies checked in the last {recent_hours}h.")
+            )
+
         vacancy_fields = _model_field_names(ApprenticeshipVacancy)
         image_field = "image_url" if "image_url" in vacancy_fields else None
 
@@ -150,16 +383,14 @@ class Command(BaseCommand):
         # MODE A: start-url override
         if start_url_override:
             self.stdout.write(self.style.WARNING("Using --start-url override (categories.json ignored)."))
-            for listed in client.iter_all_vacancies(start_url=start_url_override):
+            listings = client.iter_all_vacancies(start_url=start_url_override)
+            for listed, details_future in self._prefetch_details(client, listings, seen_refs):
                 if should_stop():
                     break
-                if listed.vacancy_ref in seen_refs:
-                    continue
-                seen_refs.add(listed.vacancy_ref)
 
                 status = self._process_one(
-                    client=client,
                     listed=listed,
+                    details_future=details_future,
                     run_id=run_id,
                     category="",
                     subcategory="",
@@ -183,6 +414,7 @@ class Command(BaseCommand):
                     f"{listed.vacancy_ref} ({status}) {listed.title}"
                 )
 
+            self._drain_images(wait=True)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Done. run_id={run_id} created={created_count}, updated={updated_count}, "
@@ -196,65 +428,77 @@ class Command(BaseCommand):
         json_path = Path(categories_file_override) if categories_file_override else _categories_json_path()
         categories = _load_categories_file(json_path)
 
-        total_queries = sum(len(v) for v in categories.values())
+        # start URLs are built up front so the list can be shuffled / sharded before any I/O
+        work_items = [
+            (category_name, sub, _build_search_url(sub))
+            for category_name, subcats in categories.items()
+            for sub in subcats
+        ]
         self.stdout.write(
             self.style.SUCCESS(
-                f"Loaded categories.json: categories={len(categories)}, total_subcategories={total_queries} ({json_path})"
+                f"Loaded categories.json: categories={len(categories)}, total_subcategories={len(work_items)} ({json_path})"
             )
         )
 
+        shard_index, shard_count = shard
+        if shard_count > 1:
+            work_items = work_items[shard_index::shard_count]
+            self.stdout.write(self.style.WARNING(f"Shard {shard_index}/{shard_count}: {len(work_items)} subcategories"))
+        if opts.get("shuffle"):
+            random.shuffle(work_items)
+
+        total_queries = len(work_items)
         q_idx = 0
-        for category_name, subcats in categories.items():
+        current_category = None
+        for category_name, sub, start_url in work_items:
             if should_stop():
                 break
 
-            self.stdout.write(self.style.WARNING(f"\nCATEGORY: {category_name} ({len(subcats)} subcategories)"))
+            if category_name != current_category:
+                current_category = category_name
+                self.stdout.write(self.style.WARNING(f"\nCATEGORY: {category_name}"))
+
+            q_idx += 1
+            if _is_acronym_search_term(sub):
+                self.stdout.write(f"  (skipping acronym search term {sub!r} — used for filtering, not search)")
+                continue
+
+            self.stdout.write(f"\n[{q_idx}/{total_queries}] category={category_name!r}, subcategory={sub!r}")
+            self.stdout.write(f"  URL: {start_url}")
 
-            for sub in subcats:
+            listings = client.iter_all_vacancies(start_url=start_url)
+            for listed, details_future in self._prefetch_details(client, listings, seen_refs):
                 if should_stop():
                     break
 
-                if _is_acronym_search_term(sub):
-                    self.stdout.write(f"  (skipping acronym search term {sub!r} — used for filtering, not search)")
-                    continue
+                status = self._process_one(
+                    listed=listed,
+                    details_future=details_future,
+                    run_id=run_id,
+                    category=category_name,
+                    subcategory=sub,
+                    start_url=start_url,
+                    no_images=no_images,
+                    refresh_images=refresh_images,
+                    image_field=image_field,
+                )
 
-                q_idx += 1
-                start_url = _build_search_url(sub)
-                self.stdout.write(f"\n[{q_idx}/{total_queries}] category={category_name!r}, subcategory={sub!r}")
-                self.stdout.write(f"  URL: {start_url}")
-
-                for listed in client.iter_all_vacancies(start_url=start_url):
-                    if should_stop():
-                        break
-                    if listed.vacancy_ref in seen_refs:
-                        continue
-                    seen_refs.add(listed.vacancy_ref)
-
-                    status = self._process_one(
-                        client=client,
-                        listed=listed,
-                        run_id=run_id,
-                        category=category_name,
-                        subcategory=sub,
-                        start_url=start_url,
-                        no_images=no_images,
-                        refresh_images=refresh_images,
-                        image_field=image_field,
-                    )
+                if status == "created":
+                    created_count += 1
+                elif status == "updated":
+                    updated_count += 1
+                elif status == "skipped":
+                    skipped_count += 1
+                else:
+                    error_count += 1
 
-                    if status == "created":
-                        created_count += 1
-                    elif status == "updated":
-                        updated_count += 1
-                    elif status == "skipped":
-                        skipped_count += 1
-                    else:
-                        error_count += 1
-
-                    self.stdout.write(
-                        f"[{created_count + updated_count}{'/' + str(max_rows) if max_rows else ''}] "
-                        f"{listed.vacancy_ref} ({status}) {listed.title}"
-                    )
+                self.stdout.write(
+                    f"[{created_count + updated_count}{'/' + str(max_rows) if max_rows else ''}] "
+                    f"{listed.vacancy_ref} ({status}) {listed.title}"
+                )
+
+            self._drain_images(wait=True)
+            self._flush_logs()
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -266,8 +510,8 @@ class Command(BaseCommand):
     def _process_one(
         self,
         *,
-        client: NcsApprenticeshipClient,
         listed,
+        details_future: Future,
         run_id,
         category: str,
         subcategory: str,
@@ -277,25 +521,14 @@ class Command(BaseCommand):
         image_field: str | None,
     ) -> str:
         try:
-            details = client.scrape_vacancy_detail(listed.url)
+            details = details_future.result()
 
             # ---- Merge listing + details (listing as fallback) ----
-            if _is_emptyish(details.get("title", "")) and listed.title:
-                details["title"] = listed.title
-            if _is_emptyish(details.get("employer_name", "")) and listed.employer_name:
-                details["employer_name"] = listed.employer_name
-            if _is_emptyish(details.get("location_summary", "")) and listed.location_summary:
-                details["location_summary"] = listed.location_summary
-            if _is_emptyish(details.get("closing_text", "")) and listed.closing_text:
-                details["closing_text"] = listed.closing_text
-            if _is_emptyish(details.get("posted_text", "")) and listed.posted_text:
-                details["posted_text"] = listed.posted_text
-            if _is_emptyish(details.get("start_date", "")) and listed.start_date:
-                details["start_date"] = listed.start_date
-            if _is_emptyish(details.get("training_course", "")) and listed.training_course:
-                details["training_course"] = listed.training_course
-            if _is_emptyish(details.get("wage", "")) and listed.wage:
-                details["wage"] = listed.wage
+            for field in _FALLBACK_FIELDS:
+                if _is_emptyish(details.get(field, "")):
+                    val = getattr(listed, field, "")
+                    if val:
+                        details[field] = val
 
             status, msg = self._upsert_smart(
                 vacancy_ref=listed.vacancy_ref,
@@ -304,48 +537,68 @@ class Command(BaseCommand):
                 category=category,
                 subcategory=subcategory,
                 run_id=run_id,
+                now=self._batch_now,
             )
 
             # --- image generation step (does NOT change scrape status) ---
             if (not no_images) and image_field:
+                log_ctx = {
+                    "run_id": run_id,
+                    "category": category,
+                    "keyword": subcategory,
+                    "start_url": start_url,
+                    "vacancy_ref": listed.vacancy_ref,
+                }
                 try:
-                    obj = ApprenticeshipVacancy.objects.get(vacancy_ref=listed.vacancy_ref)
-                    existing_url = (getattr(obj, image_field, "") or "").strip()
+                    # only the columns the image step reads, not the whole 40-column row
+                    row = (
+                        ApprenticeshipVacancy.objects.filter(vacancy_ref=listed.vacancy_ref)
+                        .values("id", "title", "employer_name", image_field)
+                        .get()
+                    )
+                    existing_url = (row[image_field] or "").strip()
 
                     if refresh_images or (not existing_url):
-                        title_for_img = (obj.title or listed.title or "").strip()
-                        employer_for_img = (obj.employer_name or listed.employer_name or "").strip()
+                        title_for_img = (row["title"] or listed.title or "").strip()
+                        employer_for_img = (row["employer_name"] or listed.employer_name or "").strip()
 
                         if title_for_img:
-                            cloud_url, _prompt_used = generate_apprenticeship_image_and_upload(
-                                vacancy_ref=str(obj.vacancy_ref),
-                                title=title_for_img,
-                                employer_name=employer_for_img,
-                                folder="ncs_apprenticeships",
-                            )
-                            cloud_url = (cloud_url or "").strip()
-                            if cloud_url and cloud_url != existing_url:
-                                setattr(obj, image_field, cloud_url)
-                                obj.save(update_fields=[image_field])
+                            key = prompt_hash(build_apprenticeship_prompt(title_for_img, employer_for_img))
+                            # --refresh-images asks for a new image, so it bypasses the cache
+                            cached_url = "" if refresh_images else self._cached_image_url(key)
+                            if cached_url:
+                                if cached_url != existing_url:
+                                    ApprenticeshipVacancy.objects.filter(pk=row["id"]).update(
+                                        **{image_field: cached_url}
+                                    )
+                            else:
+                                fut = self._image_inflight.get(key)
+                                if fut is None:
+                                    # Gemini + Cloudinary run in the background; _drain_images writes the URL
+                                    fut = self._image_pool.submit(
+                                        generate_apprenticeship_image_and_upload,
+                                        vacancy_ref=str(listed.vacancy_ref),
+                                        title=title_for_img,
+                                        employer_name=employer_for_img,
+                                        folder="ncs_apprenticeships",
+                                        # shared through ApprenticeshipImageCache, so keyed by prompt, not vacancy
+                                        public_id=f"p_{key}",
+                                    )
+                                    self._image_inflight[key] = fut
+                                self._image_jobs.append((fut, {
+                                    "pk": row["id"],
+                                    "image_field": image_field,
+                                    "existing_url": existing_url,
+                                    "prompt_hash": key,
+                                    "log_ctx": log_ctx,
+                                }))
 
                 except Exception as e:
-                    # don’t fail scrape if image fails
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Apprenticeship image generation failed vacancy_ref={listed.vacancy_ref}: {e}"
-                        )
-                    )
-                    ApprenticeshipScrapeLog.objects.create(
-                        run_id=run_id,
-                        category=category,
-                        keyword=subcategory,
-                        start_url=start_url,
-                        vacancy_ref=listed.vacancy_ref,
-                        status="image_error",
-                        message=str(e),
-                    )
+                    self._image_failed(log_ctx, e)
 
-            ApprenticeshipScrapeLog.objects.create(
+            self._drain_images(wait=False)
+
+            self._log(
                 run_id=run_id,
                 category=category,
                 keyword=subcategory,
@@ -357,7 +610,7 @@ class Command(BaseCommand):
             return status
 
         except Exception as e:
-            ApprenticeshipScrapeLog.objects.create(
+            self._log(
                 run_id=run_id,
                 category=category,
                 keyword=subcategory,
@@ -368,6 +621,89 @@ class Command(BaseCommand):
             )
             return "error"
 
+    def _drain_images(self, *, wait: bool) -> None:
+        """Store finished image uploads (main thread only). wait=True blocks on all pending jobs."""
+        pending: list[tuple[Future, dict]] = []
+        for fut, job in self._image_jobs:
+            if fut.cancelled():
+                continue
+            if not (wait or fut.done()):
+                pending.append((fut, job))
+                continue
+            key = job["prompt_hash"]
+            if self._image_inflight.get(key) is fut:
+                del self._image_inflight[key]
+            try:
+                cloud_url, _prompt_used = fut.result()
+                cloud_url = (cloud_url or "").strip()
+                if cloud_url and cloud_url != job["existing_url"]:
+                    ApprenticeshipVacancy.objects.filter(pk=job["pk"]).update(**{job["image_field"]: cloud_url})
+                # jobs sharing one generation only store it once
+                if cloud_url and self._image_urls.get(key) != cloud_url:
+                    ApprenticeshipImageCache.objects.update_or_create(
+                        prompt_hash=key, defaults={"cloud_url": cloud_url}
+                    )
+                    self._image_urls[key] = cloud_url
+            except Exception as e:
+                self._image_failed(job["log_ctx"], e)
+        self._image_jobs = pending
+
+    def _cached_image_url(self, key: str) -> str:
+        url = self._image_urls.get(key)
+        if url is None:
+            url = (
+                ApprenticeshipImageCache.objects.filter(prompt_hash=key)
+                .values_list("cloud_url", flat=True)
+                .first()
+            ) or ""
+            self._image_urls[key] = url
+        return url
+
+    def _image_failed(self, log_ctx: dict, e: Exception) -> None:
+        # don’t fail scrape if image fails
+        self.stdout.write(
+            self.style.WARNING(
+                f"Apprenticeship image generation failed vacancy_ref={log_ctx['vacancy_ref']}: {e}"
+            )
+        )
+        self._log(**log_ctx, status="image_error", message=str(e))
+
+    def _log(self, **fields) -> None:
+        fields.setdefault("created_at", self._batch_now)
+        self._log_buffer.append(ApprenticeshipScrapeLog(**fields))
+        if len(self._log_buffer) >= LOG_BATCH_SIZE:
+            self._flush_logs()
+
+    def _flush_logs(self) -> None:
+        if self._log_buffer:
+            if connection.vendor == "postgresql":
+                self._copy_logs(self._log_buffer)
+            else:
+                ApprenticeshipScrapeLog.objects.bulk_create(self._log_buffer, batch_size=LOG_BATCH_SIZE)
+            self._log_buffer.clear()
+        self._batch_now = timezone.now()
+
+    def _copy_logs(self, rows: list[ApprenticeshipScrapeLog]) -> None:
+        buf = io.StringIO()
+        # QUOTE_ALL: in CSV COPY an unquoted empty field is NULL, a quoted one is ''
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
+        for row in rows:
+            writer.writerow([getattr(row, col) for col in LOG_COPY_COLUMNS])
+        buf.seek(0)
+
+        sql = (
+            f"COPY {ApprenticeshipScrapeLog._meta.db_table} ({', '.join(LOG_COPY_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        with connection.cursor() as cur:
+            if is_psycopg3:
+                with cur.copy(sql) as copy:
+                    copy.write(buf.getvalue())
+            else:
+                cur.copy_expert(sql, buf)
+
     @transaction.atomic
     def _upsert_smart(
         self,
@@ -378,8 +714,8 @@ class Command(BaseCommand):
         category: str,
         subcategory: str,
         run_id,
+        now,
     ) -> tuple[str, str]:
-        now = timezone.now()
 
         new_vals = {
             "vacancy_url": (vacancy_url or "")[:1000],
@@ -423,9 +759,6 @@ class Command(BaseCommand):
 
             "after_this_apprenticeship": data.get("after_this_apprenticeship") or "",
             "contact_name": (data.get("contact_name") or "")[:500],
-
-            "last_checked_at": now,
-            "last_scrape_run_id": run_id,
         }
 
         if category:
@@ -433,57 +766,98 @@ class Command(BaseCommand):
         if subcategory:
             new_vals["subcategory"] = subcategory[:255]
 
-        obj, created = ApprenticeshipVacancy.objects.get_or_create(
-            vacancy_ref=vacancy_ref,
-            defaults=new_vals,
-        )
-
-        if created:
-            obj.last_scrape_status = "created"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=["last_scrape_status", "last_scrape_message"])
-            return "created", ""
+        meta = {
+            "last_checked_at": now,
+            "last_scrape_run_id": run_id,
+        }
 
-        changed_fields: list[str] = []
+        # Another run is writing this vacancy right now: leave it to that run.
+        # The xact lock is released when this atomic block ends.
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_xact_lock(hashtextextended(%s, 0))", [vacancy_ref])
+                if not cur.fetchone()[0]:
+                    return "skipped", "locked"
+
+        # Fast path: payload identical to the last scrape -> one indexed UPDATE, no row load.
+        content_hash = _content_hash(new_vals)
+        if ApprenticeshipVacancy.objects.filter(vacancy_ref=vacancy_ref, content_hash=content_hash).update(
+            **meta,
+            last_scrape_status="skipped",
+            last_scrape_message="",
+        ):
+            return "skipped", ""
 
-        if category and not (obj.category or "").strip():
-            obj.category = category[:255]
-            changed_fields.append("category")
+        # Read only the compared columns; no model instance is built.
+        existing = (
+            ApprenticeshipVacancy.objects.filter(vacancy_ref=vacancy_ref)
+            .values(*new_vals)
+            .first()
+        )
 
-        if subcategory and not (obj.subcategory or "").strip():
-            obj.subcategory = subcategory[:255]
-            changed_fields.append("subcategory")
+        if existing is None:
+            self._write_vacancy(
+                vacancy_ref=vacancy_ref,
+                values={
+                    **new_vals,
+                    **meta,
+                    "content_hash": content_hash,
+                    "last_scrape_status": "created",
+                    "last_scrape_message": "",
+                },
+                update_fields=[*new_vals, *meta, "content_hash", "last_scrape_status", "last_scrape_message"],
+            )
+            return "created", ""
 
-        for field, val in new_vals.items():
-            if field in ("last_checked_at", "last_scrape_run_id"):
-                continue
-            if getattr(obj, field) != val:
-                setattr(obj, field, val)
+        changed_fields = [
+            field
+            for field, old, new in zip(_DIFF_FIELDS, _DIFF_GETTER(existing), _DIFF_GETTER(new_vals))
+            if old != new
+        ]
+        for field in ("category", "subcategory"):
+            if field in new_vals and existing[field] != new_vals[field]:
                 changed_fields.append(field)
 
-        obj.last_checked_at = now
-        obj.last_scrape_run_id = run_id
-
         if not changed_fields:
-            obj.last_scrape_status = "skipped"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=[
+            # rows scraped before content_hash existed: backfill it here
+            ApprenticeshipVacancy.objects.filter(vacancy_ref=vacancy_ref).update(
+                **meta,
+                content_hash=content_hash,
+                last_scrape_status="skipped",
+                last_scrape_message="",
+            )
+            return "skipped", ""
+
+        msg = f"changed_fields={','.join(changed_fields)}"
+        self._write_vacancy(
+            vacancy_ref=vacancy_ref,
+            values={
+                **new_vals,
+                **meta,
+                "content_hash": content_hash,
+                "last_scrape_status": "updated",
+                "last_scrape_message": msg,
+            },
+            update_fields=changed_fields + [
+                "content_hash",
+                "scraped_at",
                 "last_checked_at",
                 "last_scrape_run_id",
                 "last_scrape_status",
                 "last_scrape_message",
-            ])
-            return "skipped", ""
-
-        msg = f"changed_fields={','.join(changed_fields)}"
-        obj.last_scrape_status = "updated"
-        obj.last_scrape_message = msg
-
-        obj.save(update_fields=changed_fields + [
-            "scraped_at",
-            "last_checked_at",
-            "last_scrape_run_id",
-            "last_scrape_status",
-            "last_scrape_message",
-        ])
+            ],
+        )
         return "updated", msg
+
+    def _write_vacancy(self, *, vacancy_ref: str, values: dict, update_fields: list[str]) -> None:
+        """Single INSERT ... ON CONFLICT (vacancy_ref) DO UPDATE for one vacancy.
+
+        Only ``update_fields`` are touched on conflict, so columns owned by other
+        jobs (image_url, geo fields, requirement_summery) are never overwritten.
+        """
+        ApprenticeshipVacancy.objects.bulk_create(
+            [ApprenticeshipVacancy(vacancy_ref=vacancy_ref, **values)],
+            update_conflicts=True,
+            unique_fields=["vacancy_ref"],
+            update_fields=update_fields,
+        )
@@ -844,15 +844,13 @@ class Command(BaseCommand):
             new_vals["subcategory"] = subcategory[:255]
 
         # ── INSERT or GET ─────────────────────────────────────────────
+        # status goes into the INSERT itself: no follow-up UPDATE for new rows
         obj, created = ApprenticeshipVacancy.objects.get_or_create(
             vacancy_ref=detail.vacancy_ref,
-            defaults=new_vals,
+            defaults={**new_vals, "last_scrape_status": "created", "last_scrape_message": ""},
         )
 
         if created:
-            obj.last_scrape_status  = "created"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=["last_scrape_status", "last_scrape_message"])
             return "created", ""
 
         # ── Detect changed fields ─────────────────────────────────────
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apprenticeship', '0005_apprenticeshipvacancy_requirement_summery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apprenticeshipvacancy',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=32),
+        ),
+    ]
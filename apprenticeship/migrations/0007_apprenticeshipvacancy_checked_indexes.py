@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # REQUIRED for CREATE INDEX CONCURRENTLY
+
+    dependencies = [
+        ('apprenticeship', '0006_apprenticeshipvacancy_content_hash'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='apprenticeshipvacancy',
+            index=models.Index(fields=['category', 'subcategory', 'last_checked_at'], name='appr_vac_cat_sub_checked_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='apprenticeshipvacancy',
+            index=models.Index(fields=['last_checked_at'], include=('vacancy_ref',), name='appr_vac_checked_ref_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False  # REQUIRED for CREATE INDEX CONCURRENTLY
+
+    dependencies = [
+        ('apprenticeship', '0007_apprenticeshipvacancy_checked_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='apprenticeshipvacancy',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='appr_vac_title_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='apprenticeshipvacancy',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('employer_name'), name='gin_trgm_ops'), name='appr_vac_employer_trgm_idx'),
+        ),
+    ]
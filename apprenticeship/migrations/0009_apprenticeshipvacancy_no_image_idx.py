@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:55
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # REQUIRED for CREATE INDEX CONCURRENTLY
+
+    dependencies = [
+        ('apprenticeship', '0008_apprenticeshipvacancy_trgm_search_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='apprenticeshipvacancy',
+            index=models.Index(condition=models.Q(('image_url', '')), fields=['vacancy_ref'], name='vac_no_image_idx'),
+        ),
+    ]
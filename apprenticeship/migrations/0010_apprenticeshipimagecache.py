@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-16 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apprenticeship', '0009_apprenticeshipvacancy_no_image_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApprenticeshipImageCache',
+            fields=[
+                ('prompt_hash', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('cloud_url', models.URLField(max_length=1000)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -1,5 +1,7 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class ApprenticeshipScrapeLog(models.Model):
@@ -106,6 +108,41 @@ class ApprenticeshipVacancy(models.Model):
     last_scrape_status = models.CharField(max_length=20, blank=True, default="")
     last_scrape_message = models.TextField(blank=True, default="")
     last_scrape_run_id = models.UUIDField(null=True, blank=True, db_index=True)
+    # blake2b of the last scraped payload; lets unchanged vacancies skip the field diff
+    content_hash = models.CharField(max_length=32, blank=True, default="", db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "subcategory", "last_checked_at"],
+                name="appr_vac_cat_sub_checked_idx",
+            ),
+            # covering index: --skip-if-checked-within-hours reads vacancy_ref from the index only
+            models.Index(
+                fields=["last_checked_at"],
+                include=["vacancy_ref"],
+                name="appr_vac_checked_ref_idx",
+            ),
+            # admin "^title" / "^employer_name" search runs UPPER(col) LIKE 'Q%'
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="appr_vac_title_trgm_idx"),
+            GinIndex(OpClass(Upper("employer_name"), name="gin_trgm_ops"), name="appr_vac_employer_trgm_idx"),
+            # partial: only rows still waiting for an image, so the backfill worklist stays tiny
+            models.Index(
+                fields=["vacancy_ref"],
+                condition=models.Q(image_url=""),
+                name="vac_no_image_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.vacancy_ref})"
+
+
+class ApprenticeshipImageCache(models.Model):
+    # sha1 of the Gemini prompt: vacancies with the same title + employer share one generated image
+    prompt_hash = models.CharField(max_length=40, primary_key=True)
+    cloud_url = models.URLField(max_length=1000)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.prompt_hash} -> {self.cloud_url}"
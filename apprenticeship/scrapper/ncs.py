@@ -1,25 +1,32 @@
 # apprenticeship/scrapper/ncs.py
 from __future__ import annotations
 
+import json
 import re
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from lxml import etree
 from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 from urllib3.util.retry import Retry
 
+Element = etree._Element
+# a detail-page section: the sibling elements between two headings, in document order
+Scope = List[Element]
+
 BASE = "https://www.findapprenticeship.service.gov.uk"
 VACANCY_PATH_RE = re.compile(r"^/apprenticeship/(VAC\d+)\b", re.I)
 
-PUNCT_ONLY_RE = re.compile(r"^[\s,.;:–—-]+$")
 URL_RE = re.compile(r"(https?://[^\s)]+)", re.I)
 DOMAINISH_RE = re.compile(r"^(?:https?://|www\.)\S+$", re.I)
 
-UI_SKIP_LINES = {
+UI_SKIP_LINES = frozenset({
     "skip to main content",
     "print",
     "contents",
@@ -33,11 +40,90 @@ UI_SKIP_LINES = {
     "apply now",
     "account",
     "menu",
-}
+})
+# a line longer than this can't be a UI label, so it is never lower()-ed
+_UI_SKIP_MAX_LEN = max(map(len, UI_SKIP_LINES))
+
+# punctuation-only lines (was ^[\s,.;:–—-]+$): delete the punctuation, what's left must be whitespace
+_PUNCT_DELETE = str.maketrans("", "", ",.;:–—-")
+
+
+def _is_noise_line(ln: str) -> bool:
+    """Punctuation-only or UI chrome line. `ln` must already be stripped and non-empty."""
+    if not ln.translate(_PUNCT_DELETE).strip():
+        return True
+    return len(ln) <= _UI_SKIP_MAX_LEN and ln.lower() in UI_SKIP_LINES
+
+
+# visible text nodes only: script/style/template contents are not page text
+_TEXT_NODES = etree.XPath("descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+# compiled once; node.xpath("...") would re-compile the expression on every call
+_XP_APPR_LINKS = etree.XPath('.//a[starts-with(@href, "/apprenticeship/")]')
+_XP_REL_NEXT = etree.XPath('.//a[@rel="next"][@href]')
+_XP_A_HREF = etree.XPath(".//a[@href]")
+# descendant-or-self: a scope member can itself be the <ul>
+_XP_UL_LI = etree.XPath("descendant-or-self::ul//li")
+_XP_DETAILS_TEXT = etree.XPath('.//*[contains(concat(" ", normalize-space(@class), " "), " govuk-details__text ")]')
 
 
 def clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    # str.split() and the old re.sub(r"\s+", " ", ...) treat exactly the same code points as whitespace
+    if not s:
+        return ""
+    return " ".join(s.split())
+
+
+def _text(node: Element, sep: str = "") -> str:
+    """Same result as bs4's node.get_text(sep, strip=True)."""
+    return sep.join(t for t in (s.strip() for s in _TEXT_NODES(node)) if t)
+
+
+def _is_tag(node) -> bool:
+    # comments / processing instructions are elements in lxml but not Tags in bs4
+    return isinstance(node.tag, str)
+
+
+# huge_tree: no libxml2 size/depth caps on big listing pages; recover: tag soup is fine
+_PARSER_OPTIONS = dict(recover=True, huge_tree=True, remove_pis=True)
+PARSE_CHUNK_SIZE = 64 * 1024
+
+
+def _html_parser(encoding: Optional[str] = None) -> etree.HTMLParser:
+    # A fresh parser per page (under a microsecond to build): lxml parsers must not be
+    # shared between threads, and a feed() aborted mid-page would leak into the next one.
+    # Plain etree parser, not lxml.html's: HtmlElement proxies go through a
+    # Python-level class lookup for every node touched.
+    try:
+        return etree.HTMLParser(encoding=encoding, **_PARSER_OPTIONS)
+    except LookupError:
+        # charset name libxml2 doesn't know: let it sniff <meta charset> instead
+        return etree.HTMLParser(**_PARSER_OPTIONS)
+
+
+def _parse_response(r: requests.Response) -> Element:
+    """
+    Feed the (decompressed) body into lxml chunk by chunk, instead of holding
+    r.content and the decoded r.text in memory before parsing.
+    """
+    # same charset requests would use for r.text when the server sends one;
+    # otherwise lxml reads <meta charset> itself
+    content_type = (r.headers.get("Content-Type") or "").lower()
+    parser = _html_parser(r.encoding if "charset=" in content_type else None)
+    for chunk in r.iter_content(chunk_size=PARSE_CHUNK_SIZE):
+        parser.feed(chunk)
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        root = None
+    if root is None:
+        # empty / whitespace-only body
+        root = etree.Element("html")
+    return root
+
+
+def _find_first(root: Element, tag: str) -> Optional[Element]:
+    return next(root.iterdescendants(tag), None)
 
 
 def abs_url(href: str, base: str = BASE) -> str:
@@ -52,94 +138,181 @@ def cleanup_lines(text: str) -> str:
             if out and out[-1] != "":
                 out.append("")
             continue
-        if PUNCT_ONLY_RE.match(ln):
-            continue
-        low = ln.lower().strip()
-        if low in UI_SKIP_LINES:
+        if _is_noise_line(ln):
             continue
         out.append(ln)
     return "\n".join(out).strip()
 
 
-def _lines(node: Tag) -> List[str]:
-    raw = node.get_text("\n", strip=True)
+def _lines(node: Element) -> List[str]:
+    return _lines_from_text(_text(node, "\n"))
+
+
+def _scope_text(scope: Scope, sep: str = "") -> str:
+    """_text() over a whole scope, as if its elements shared one parent."""
+    return sep.join(t for t in (_text(n, sep) for n in scope) if t)
+
+
+def _scope_lines(scope: Scope) -> List[str]:
+    return _lines_from_text(_scope_text(scope, "\n"))
+
+
+def _lines_from_text(raw: str) -> List[str]:
+    """_lines() for a scope whose "\n"-joined text was already extracted."""
     out: List[str] = []
     for ln in raw.splitlines():
         ln = ln.strip()
         if not ln:
             continue
-        if PUNCT_ONLY_RE.match(ln):
-            continue
-        if ln.lower().strip() in UI_SKIP_LINES:
+        if _is_noise_line(ln):
             continue
         out.append(ln)
     return out
 
 
-def _find_after_label(lines: List[str], label: str) -> str:
+def _clean_lines(text: str) -> List[str]:
+    return [c for c in map(clean, text.splitlines()) if c]
+
+
+def _find_after_labels(lines: List[str], labels: Tuple[str, ...]) -> Dict[str, str]:
     """
+    Value for each label, from a single pass over lines (first match per label wins).
     Works when:
       - label on one line and value on next
       - label + value on same line
     """
-    base = label.strip().rstrip(":").lower()
+    # keyed by the label's first word, so each line costs one dict lookup
+    by_word: Dict[str, List[Tuple[str, int, str]]] = {}
+    out: Dict[str, str] = {}
+    for label in labels:
+        base = label.strip().rstrip(":").lower()
+        by_word.setdefault(base.split(" ", 1)[0], []).append((base, len(label), label))
+        out[label] = ""
+
+    pending = len(labels)
+    last = len(lines) - 1
     for i, ln in enumerate(lines):
         t = clean(ln)
         low = t.lower()
-        if low == base:
-            return clean(lines[i + 1]) if i + 1 < len(lines) else ""
-        if low.startswith(base + " "):
-            return clean(t[len(label):])
-    return ""
+        entries = by_word.get(low.split(" ", 1)[0])
+        if not entries:
+            continue
+        for entry in list(entries):
+            base, cut, label = entry
+            if low == base:
+                out[label] = clean(lines[i + 1]) if i < last else ""
+            elif low.startswith(base + " "):
+                out[label] = clean(t[cut:])
+            else:
+                continue
+            entries.remove(entry)
+            pending -= 1
+        if not pending:
+            break
+    return out
+
 
+# labelled values in a detail page's Summary section
+_SUMMARY_LABELS = ("Wage", "Training course", "Hours", "Start date", "Duration", "Positions available")
+
+
+# listing card labels, keyed by first word so each line costs one dict lookup
+_CARD_LABELS = {
+    "start": ("start date", "start_date"),
+    "training": ("training course", "training_course"),
+    "wage": ("wage", "wage"),
+}
 
-def _bullet_items(scope: Tag) -> List[str]:
+
+def _parse_card_lines(lines: List[str], title: str) -> Dict[str, str]:
+    """
+    Single pass over a listing card's lines. Same results as looking up the
+    title line, calling _find_after_label for each card label and scanning for
+    the (last) Closes / Posted lines separately.
+    """
+    out = dict.fromkeys(
+        ("employer_name", "location_summary", "start_date", "training_course", "wage", "closing_text", "posted_text"),
+        "",
+    )
+    title_found = not title
+    found_labels: set[str] = set()
+    n = len(lines)
+
+    for i, ln in enumerate(lines):
+        if not title_found and ln == title:
+            title_found = True
+            if i + 1 < n:
+                out["employer_name"] = lines[i + 1]
+            if i + 2 < n:
+                out["location_summary"] = lines[i + 2]
+
+        t = clean(ln)
+        low = t.lower()
+
+        label = _CARD_LABELS.get(low.split(" ", 1)[0])
+        if label and label[1] not in found_labels:
+            base, field = label
+            if low == base:
+                out[field] = clean(lines[i + 1]) if i + 1 < n else ""
+                found_labels.add(field)
+            elif low.startswith(base + " "):
+                out[field] = clean(t[len(base):])
+                found_labels.add(field)
+
+        if low.startswith("closes"):
+            out["closing_text"] = ln
+        elif low.startswith("posted"):
+            out["posted_text"] = ln
+
+    return out
+
+
+def _bullet_items(scope: Scope) -> List[str]:
     items: List[str] = []
-    for li in scope.select("ul li"):
-        t = clean(li.get_text(" ", strip=True))
-        if t:
-            items.append(t)
+    for node in scope:
+        for li in _XP_UL_LI(node):
+            t = clean(_text(li, " "))
+            if t:
+                items.append(t)
     return items
 
 
-def _bullets_text(scope: Tag) -> str:
+def _bullets_text(scope: Scope) -> str:
     return "\n".join(_bullet_items(scope)).strip()
 
 
-def _find_h2(root: Tag, title: str) -> Optional[Tag]:
-    wanted = title.strip().lower()
-    for h2 in root.find_all("h2"):
-        if clean(h2.get_text(" ", strip=True)).lower() == wanted:
-            return h2
-    return None
+def _heading_index(scope: Scope, *tags: str) -> Dict[str, List[Element]]:
+    """One walk over the scope's headings: normalised title -> headings in document order."""
+    index: Dict[str, List[Element]] = {}
+    for node in scope:
+        for h in node.iter(*tags):
+            index.setdefault(clean(_text(h, " ")).lower(), []).append(h)
+    return index
+
 
+def _find_heading(index: Dict[str, List[Element]], title: str) -> Optional[Element]:
+    hs = index.get(title.strip().lower())
+    return hs[0] if hs else None
 
-def _collect_until_next_h2(start_h2: Tag) -> Tag:
-    tmp = BeautifulSoup("<div></div>", "lxml").div  # type: ignore
-    for sib in start_h2.next_siblings:
-        if isinstance(sib, Tag) and sib.name == "h2":
+
+def _siblings_until(start: Element, stop_tags: Tuple[str, ...]) -> Scope:
+    # plain references: the page tree is left as parsed, so nested scopes can overlap freely
+    sibs: Scope = []
+    for sib in start.itersiblings():
+        if not _is_tag(sib):
+            continue
+        if sib.tag in stop_tags:
             break
-        if isinstance(sib, Tag):
-            tmp.append(sib)
-    return tmp  # type: ignore
+        sibs.append(sib)
+    return sibs
 
 
-def _find_h3_in_scope(scope: Tag, title: str) -> Optional[Tag]:
-    wanted = title.strip().lower()
-    for h in scope.find_all(["h3", "h4"]):
-        if clean(h.get_text(" ", strip=True)).lower() == wanted:
-            return h
-    return None
+def _collect_until_next_h2(start_h2: Element) -> Scope:
+    return _siblings_until(start_h2, ("h2",))
 
 
-def _collect_until_next_h3_or_h2(start_h: Tag) -> Tag:
-    tmp = BeautifulSoup("<div></div>", "lxml").div  # type: ignore
-    for sib in start_h.next_siblings:
-        if isinstance(sib, Tag) and sib.name in ("h2", "h3"):
-            break
-        if isinstance(sib, Tag):
-            tmp.append(sib)
-    return tmp  # type: ignore
+def _collect_until_next_h3_or_h2(start_h: Element) -> Scope:
+    return _siblings_until(start_h, ("h2", "h3"))
 
 
 # ---------------- URL + "details/dl" helpers ----------------
@@ -163,15 +336,17 @@ def _looks_like_domain(u: str) -> bool:
 
 def _first_link_or_domain_from_text(text: str) -> str:
     text = (text or "").strip()
-    if not text:
+    # every URL / www. / domain form below needs a "." or a "/": skip the regex work for plain text
+    if not text or ("." not in text and "/" not in text):
         return ""
     # try full URL regex first
-    m = URL_RE.search(text)
-    if m:
-        return _normalize_url(m.group(1))
-    # else scan tokens
-    for token in re.split(r"[\s,]+", text):
-        t = token.strip().strip("()[]{}<>.,;")
+    if "://" in text:
+        m = URL_RE.search(text)
+        if m:
+            return _normalize_url(m.group(1))
+    # else scan tokens (same tokens as re.split(r"[\s,]+", text), minus the empty ones)
+    for token in text.replace(",", " ").split():
+        t = token.strip("()[]{}<>.,;")
         if not t:
             continue
         if DOMAINISH_RE.match(t):
@@ -183,67 +358,72 @@ def _first_link_or_domain_from_text(text: str) -> str:
     return ""
 
 
-def _dl_value(scope: Tag, label: str) -> str:
+def _dl_value(scope: Scope, label: str) -> str:
     wanted = label.strip().lower().rstrip(":")
-    for dt in scope.find_all("dt"):
-        dt_text = clean(dt.get_text(" ", strip=True)).lower().rstrip(":")
+    for dt in (dt for node in scope for dt in node.iter("dt")):
+        dt_text = clean(_text(dt, " ")).lower().rstrip(":")
         if dt_text != wanted:
             continue
-        dd = dt.find_next_sibling("dd")
-        if not dd:
+        dd = next(dt.itersiblings("dd"), None)
+        if dd is None:
             return ""
-        for a in dd.select("a[href]"):
+        for a in _XP_A_HREF(dd):
             href = (a.get("href") or "").strip()
             if href:
                 return _normalize_url(href)
-        return _first_link_or_domain_from_text(dd.get_text(" ", strip=True))
+        return _first_link_or_domain_from_text(_text(dd, " "))
     return ""
 
 
-def _details_block_text(scope: Tag, summary_label: str) -> str:
+def _details_block_text(scope: Scope, summary_label: str) -> str:
     wanted = summary_label.strip().lower().rstrip(":")
-    for d in scope.find_all("details"):
-        summ = d.find("summary")
-        if not summ:
+    for d in (d for node in scope for d in node.iter("details")):
+        summ = _find_first(d, "summary")
+        if summ is None:
             continue
-        s_txt = clean(summ.get_text(" ", strip=True)).lower().rstrip(":")
+        s_txt = clean(_text(summ, " ")).lower().rstrip(":")
         if s_txt != wanted:
             continue
-        body = d.select_one(".govuk-details__text") or d
-        txt = body.get_text("\n", strip=True)
+        bodies = _XP_DETAILS_TEXT(d)
+        body = bodies[0] if bodies else d
+        txt = _text(body, "\n")
         # remove summary line if duplicated
-        txt = txt.replace(summ.get_text(" ", strip=True), "")
+        txt = txt.replace(_text(summ, " "), "")
         return cleanup_lines(txt)
     return ""
 
 
+# headings that end a block in _extract_block_after_label
+_BLOCK_STOPPERS = frozenset({
+    "training provider",
+    "training course",
+    "what you'll learn",
+    "training schedule",
+    "more training information",
+    "requirements",
+    "about this employer",
+    "after this apprenticeship",
+    "ask a question",
+    "company benefits",
+    "employer website",
+    "work",
+    "where you'll work",
+    "what you'll do at work",
+})
+
+
 def _extract_block_after_label(lines: List[str], label: str) -> str:
     """
     Line fallback:
       match 'Label', 'Label:' or 'Label -', return following block (until a known stopper).
     """
     base = label.strip().lower().rstrip(":")
-    stoppers = {
-        "training provider",
-        "training course",
-        "what you'll learn",
-        "training schedule",
-        "more training information",
-        "requirements",
-        "about this employer",
-        "after this apprenticeship",
-        "ask a question",
-        "company benefits",
-        "employer website",
-        "work",
-        "where you'll work",
-        "what you'll do at work",
-    }
+    prefixes = (base + ":", base + " -")
 
     for i, ln in enumerate(lines):
-        low = clean(ln).lower().strip()
-        low2 = low.rstrip(":")
-        if low2 == base or low.startswith(base + ":") or low.startswith(base + " -"):
+        # clean() already strips and lower() adds no whitespace
+        low = clean(ln).lower()
+        if low.rstrip(":") == base or low.startswith(prefixes):
             # inline remainder
             inline = ""
             if ":" in ln:
@@ -252,22 +432,19 @@ def _extract_block_after_label(lines: List[str], label: str) -> str:
                 return cleanup_lines(_first_link_or_domain_from_text(inline) or inline)
 
             block: List[str] = []
-            j = i + 1
-            while j < len(lines):
-                nxt = clean(lines[j]).lower().strip()
-                if nxt in stoppers:
+            for nxt in lines[i + 1:]:
+                if clean(nxt).lower() in _BLOCK_STOPPERS:
                     break
-                block.append(lines[j])
-                j += 1
+                block.append(nxt)
             return cleanup_lines("\n".join(block))
     return ""
 
 
-def _first_external_href(scope: Tag) -> str:
+def _first_external_href(scope: Scope) -> str:
     """
     Generic: return first external-ish href found in scope; skip gov.uk and this service.
     """
-    for a in scope.select("a[href]"):
+    for a in (a for node in scope for a in node.iter("a")):
         href = (a.get("href") or "").strip()
         if not href:
             continue
@@ -278,11 +455,87 @@ def _first_external_href(scope: Tag) -> str:
         if low.startswith("http"):
             return href
     # fallback: scan visible text
-    return _first_link_or_domain_from_text(scope.get_text(" ", strip=True))
+    return _first_link_or_domain_from_text(_scope_text(scope, " "))
+
+
+# Retry is immutable (urllib3 derives a new one per attempt), so every client shares this one
+# 429 and 503 are not retried here: _get() handles them, waiting out Retry-After and
+# slowing the shared pacing (urllib3 would otherwise retry them on its own backoff)
+_RETRY = Retry(
+    total=5,
+    backoff_factor=0.6,
+    status_forcelist=(500, 502, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=False,
+)
+
+# adaptive pacing: each 429/503 doubles the request gap (up to THROTTLE_MAX_GAP),
+# every THROTTLE_RECOVER_AFTER successes in a row halve it back towards `delay`
+THROTTLE_MAX_GAP = 30.0
+THROTTLE_RECOVER_AFTER = 10
+THROTTLE_MAX_ATTEMPTS = 6
+THROTTLE_STATUSES = (429, 503)
+
+
+# bump whenever scrape_vacancy_detail's output changes, so cached results are re-parsed
+DETAIL_CACHE_VERSION = 1
+
+
+class DetailCache:
+    """
+    On-disk (sqlite) cache of parsed vacancy pages, keyed by URL and revalidated
+    with the ETag / Last-Modified the site sent: a 304 skips both the body and the parse.
+    Safe to share between the client's detail threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detail_cache ("
+                "url TEXT PRIMARY KEY, etag TEXT NOT NULL, last_modified TEXT NOT NULL, details TEXT NOT NULL)"
+            )
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != DETAIL_CACHE_VERSION:
+                self._db.execute("DELETE FROM detail_cache")
+                self._db.execute(f"PRAGMA user_version = {DETAIL_CACHE_VERSION:d}")
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+        """(conditional request headers, cached details), or None if the URL isn't cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, details FROM detail_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, details = row
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers, json.loads(details)
+
+    def put(self, url: str, response_headers, details: Dict[str, str]) -> None:
+        etag = response_headers.get("ETag") or ""
+        last_modified = response_headers.get("Last-Modified") or ""
+        with self._lock, self._db:
+            if not (etag or last_modified):
+                # nothing to revalidate with next time
+                self._db.execute("DELETE FROM detail_cache WHERE url = ?", (url,))
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO detail_cache (url, etag, last_modified, details) VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(details)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
 
 # ---------------- Listing DTO ----------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListedVacancy:
     vacancy_ref: str
     url: str
@@ -303,47 +556,116 @@ class NcsApprenticeshipClient:
       - scrape_vacancy_detail(url) returns dict of all fields from the vacancy page sections
     """
 
-    def __init__(self, *, delay: float = 0.7, timeout: int = 30) -> None:
+    def __init__(
+        self,
+        *,
+        delay: float = 0.7,
+        timeout: int = 30,
+        pool_size: int = 10,
+        cache_path: str = "",
+    ) -> None:
         self.delay = delay
         self.timeout = timeout
+        # optional: revalidate vacancy pages seen by an earlier run instead of re-downloading them
+        self.cache = DetailCache(cache_path) if cache_path else None
 
         self.sess = requests.Session()
-        self.sess.headers.update({"User-Agent": "Mozilla/5.0 (compatible; DjangoScraper/1.0)"})
-
-        retry = Retry(
-            total=5,
-            backoff_factor=0.6,
-            status_forcelist=(429, 500, 502, 503, 504),
-            allowed_methods=("GET",),
+        self.sess.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (compatible; DjangoScraper/1.0)",
+                # everything urllib3 can decode here: gzip/deflate, plus br once Brotli is installed
+                "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+            }
         )
-        self.sess.mount("https://", HTTPAdapter(max_retries=retry))
-        self.sess.mount("http://", HTTPAdapter(max_retries=retry))
 
-    def soup(self, url: str) -> BeautifulSoup:
-        r = self.sess.get(url, timeout=self.timeout)
-        r.raise_for_status()
-        time.sleep(self.delay)
-        return BeautifulSoup(r.text, "lxml")
+        # one keep-alive connection per concurrent caller, otherwise urllib3 drops
+        # the surplus connections after each request ("Connection pool is full")
+        adapter = HTTPAdapter(max_retries=_RETRY, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.sess.mount("https://", adapter)
+        self.sess.mount("http://", adapter)
+
+        # `delay` is the minimum gap between request starts, shared by every
+        # thread using this client (the scrape command fetches details in a pool).
+        # The gap grows while the site answers 429/503 and shrinks back once it stops.
+        self._pace_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._gap = delay
+        self._ok_streak = 0
+
+    def _pace(self) -> None:
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._gap
+        if wait > 0:
+            time.sleep(wait)
+
+    def _throttled(self, r: requests.Response) -> None:
+        try:
+            retry_after = _RETRY.parse_retry_after(r.headers.get("Retry-After") or "0")
+        except Exception:
+            retry_after = 0.0
+        with self._pace_lock:
+            self._ok_streak = 0
+            self._gap = min(max(self._gap * 2, 1.0), THROTTLE_MAX_GAP)
+            self._next_request_at = max(self._next_request_at, time.monotonic() + retry_after)
+
+    def _succeeded(self) -> None:
+        with self._pace_lock:
+            if self._gap <= self.delay:
+                return
+            self._ok_streak += 1
+            if self._ok_streak >= THROTTLE_RECOVER_AFTER:
+                self._ok_streak = 0
+                half = self._gap / 2
+                # snap back once close, so delay=0 really returns to 0
+                self._gap = half if half > max(self.delay, 0.1) else self.delay
+
+    def close(self) -> None:
+        self.sess.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Paced, streamed GET; 429/503s widen the shared gap and are retried."""
+        for _ in range(THROTTLE_MAX_ATTEMPTS):
+            self._pace()
+            r = self.sess.get(url, headers=headers, timeout=self.timeout, stream=True)
+            if r.status_code not in THROTTLE_STATUSES:
+                break
+            r.close()
+            self._throttled(r)
+        return r
+
+    def page(self, url: str) -> Element:
+        """GET + parse straight into an lxml tree (no bs4 wrapper objects)."""
+        # stream=True: close() hands the connection back to the pool even if parsing fails
+        with self._get(url) as r:
+            r.raise_for_status()
+            self._succeeded()
+            return _parse_response(r)
 
     # ---------------- Pagination ----------------
-    def iter_pages(self, start_url: str) -> Iterable[Tuple[str, BeautifulSoup]]:
+    def iter_pages(self, start_url: str) -> Iterable[Tuple[str, Element]]:
         seen = set()
         url = start_url
         while url and url not in seen:
             seen.add(url)
-            s = self.soup(url)
-            yield url, s
-            url = self._next_url(s, current=url)
-
-    def _next_url(self, soup: BeautifulSoup, *, current: str) -> Optional[str]:
-        main = soup.find("main") or soup
-        rel_next = main.select_one('a[rel="next"][href]')
+            root = self.page(url)
+            yield url, root
+            url = self._next_url(root, current=url)
+
+    def _next_url(self, root: Element, *, current: str) -> Optional[str]:
+        main = _find_first(root, "main")
+        if main is None:
+            main = root
+        rel_next = _XP_REL_NEXT(main)
         if rel_next:
-            return abs_url(rel_next["href"], base=current)
+            return abs_url(rel_next[0].get("href"), base=current)
 
-        for a in main.select("a[href]"):
-            if clean(a.get_text()).lower().startswith("next"):
-                return abs_url(a["href"], base=current)
+        for a in _XP_A_HREF(main):
+            if clean("".join(_TEXT_NODES(a))).lower().startswith("next"):
+                return abs_url(a.get("href"), base=current)
         return None
 
     # ---------------- Listing ----------------
@@ -352,113 +674,120 @@ class NcsApprenticeshipClient:
             for v in self._extract_vacancies_from_list(page):
                 yield v
 
-    def _vac_refs_in_node(self, node: Tag) -> set[str]:
-        refs: set[str] = set()
-        for a in node.select('a[href^="/apprenticeship/"]'):
-            href = a.get("href") or ""
-            m = VACANCY_PATH_RE.match(href)
-            if m:
-                refs.add(m.group(1).upper())
-        return refs
-
-    def _find_result_card(self, link: Tag, *, vacancy_ref: str) -> Optional[Tag]:
-        node: Optional[Tag] = link
+    def _vac_refs_by_node(self, root: Element) -> Dict[Element, set[str]]:
+        """
+        Vacancy refs linked from inside each element, built bottom-up in one pass
+        over the page's vacancy links (replaces a subtree search per climb step).
+        """
+        refs_by_node: Dict[Element, set[str]] = {}
+        for a in _XP_APPR_LINKS(root):
+            m = VACANCY_PATH_RE.match(a.get("href") or "")
+            if not m:
+                continue
+            ref = m.group(1).upper()
+            for anc in a.iterancestors():
+                refs_by_node.setdefault(anc, set()).add(ref)
+        return refs_by_node
+
+    def _find_result_card(
+        self, link: Element, *, vacancy_ref: str, refs_by_node: Dict[Element, set[str]]
+    ) -> Optional[Element]:
+        node: Optional[Element] = link
         for _ in range(15):
-            if not isinstance(node, Tag):
+            if node is None:
                 return None
 
-            refs = self._vac_refs_in_node(node)
-            if refs and refs == {vacancy_ref}:
-                txt = node.get_text(" ", strip=True)
+            refs = refs_by_node.get(node)
+            if refs and len(refs) == 1 and vacancy_ref in refs:
+                if node.tag in ("article", "li", "section", "div"):
+                    return node
+                txt = _text(node, " ")
                 hits = sum(1 for lab in ("Start date", "Training course", "Wage", "Closes", "Posted") if lab in txt)
-                if hits >= 2 or node.name in ("article", "li", "section", "div"):
+                if hits >= 2:
                     return node
 
-            node = node.parent if isinstance(node.parent, Tag) else None
+            node = node.getparent()
         return None
 
-    def _extract_vacancies_from_list(self, soup: BeautifulSoup) -> List[ListedVacancy]:
-        main = soup.find("main") or soup
+    def _extract_vacancies_from_list(self, root: Element) -> List[ListedVacancy]:
+        main = _find_first(root, "main")
+        if main is None:
+            main = root
         out: List[ListedVacancy] = []
+        seen: set[str] = set()
+        # cards can sit above <main>, so count links across the whole document
+        refs_by_node = self._vac_refs_by_node(root.getroottree().getroot())
 
-        for a in main.select('a[href^="/apprenticeship/"]'):
+        for a in _XP_APPR_LINKS(main):
             href = a.get("href") or ""
             m = VACANCY_PATH_RE.match(href)
             if not m:
                 continue
 
             vacancy_ref = m.group(1).upper()
+            if vacancy_ref in seen:
+                continue
             url = abs_url(href)
-            title = clean(a.get_text(" ", strip=True))
+            title = clean(_text(a, " "))
 
-            card = self._find_result_card(a, vacancy_ref=vacancy_ref)
-            if not card:
+            card = self._find_result_card(a, vacancy_ref=vacancy_ref, refs_by_node=refs_by_node)
+            if card is None:
                 continue
 
             lines = _lines(card)
 
-            employer_name = ""
-            location_summary = ""
-            if title and title in lines:
-                i = lines.index(title)
-                if i + 1 < len(lines):
-                    employer_name = lines[i + 1]
-                if i + 2 < len(lines):
-                    location_summary = lines[i + 2]
-
-            start_date = _find_after_label(lines, "Start date")
-            training_course = _find_after_label(lines, "Training course")
-            wage = _find_after_label(lines, "Wage")
-
-            closing_text = ""
-            posted_text = ""
-            for ln in lines:
-                low = ln.lower().strip()
-                if low.startswith("closes"):
-                    closing_text = ln
-                elif low.startswith("posted"):
-                    posted_text = ln
-
+            seen.add(vacancy_ref)
             out.append(
                 ListedVacancy(
                     vacancy_ref=vacancy_ref,
                     url=url,
                     title=title,
-                    employer_name=employer_name,
-                    location_summary=location_summary,
-                    start_date=start_date,
-                    training_course=training_course,
-                    wage=wage,
-                    closing_text=closing_text,
-                    posted_text=posted_text,
+                    **_parse_card_lines(lines, title),
                 )
             )
 
-        seen = set()
-        dedup: List[ListedVacancy] = []
-        for v in out:
-            if v.vacancy_ref not in seen:
-                seen.add(v.vacancy_ref)
-                dedup.append(v)
-        return dedup
+        return out
 
     # ---------------- Details ----------------
     def scrape_vacancy_detail(self, vacancy_url: str) -> Dict[str, str]:
-        s = self.soup(vacancy_url)
-        main = s.find("main") or s
+        if self.cache is None:
+            return self._parse_vacancy_detail(self.page(vacancy_url))
+
+        cached = self.cache.get(vacancy_url)
+        with self._get(vacancy_url, headers=cached[0] if cached else None) as r:
+            if r.status_code == 304 and cached is not None:
+                self._succeeded()
+                return cached[1]
+            r.raise_for_status()
+            self._succeeded()
+            root = _parse_response(r)
+            response_headers = r.headers
+
+        details = self._parse_vacancy_detail(root)
+        self.cache.put(vacancy_url, response_headers, details)
+        return details
+
+    def _parse_vacancy_detail(self, root: Element) -> Dict[str, str]:
+        main = _find_first(root, "main")
+        if main is None:
+            main = root
 
         # Header/top area
-        h1 = main.find("h1")
-        title = clean(h1.get_text(" ", strip=True)) if h1 else ""
+        h1 = _find_first(main, "h1")
+        title = clean(_text(h1, " ")) if h1 is not None else ""
 
-        all_lines = [clean(x) for x in main.get_text("\n", strip=True).splitlines() if clean(x)]
+        all_lines = _clean_lines(_text(main, "\n"))
         employer_name = ""
         location_summary = ""
         closing_text = ""
         posted_text = ""
 
-        if title and title in all_lines:
-            i = all_lines.index(title)
+        # one C-level scan (list.index) instead of `in` followed by .index()
+        try:
+            i = all_lines.index(title) if title else -1
+        except ValueError:
+            i = -1
+        if i >= 0:
             if i + 1 < len(all_lines):
                 employer_name = all_lines[i + 1]
             if i + 2 < len(all_lines):
@@ -481,40 +810,45 @@ class NcsApprenticeshipClient:
         duration = ""
         positions_available = ""
 
-        summary_h2 = _find_h2(main, "Summary")
-        if summary_h2:
+        h2s = _heading_index([main], "h2")
+
+        summary_h2 = _find_heading(h2s, "Summary")
+        if summary_h2 is not None:
             scope = _collect_until_next_h2(summary_h2)
-            lines = _lines(scope)
+            lines = _scope_lines(scope)
 
-            wage = _find_after_label(lines, "Wage")
-            training_course = _find_after_label(lines, "Training course")
-            hours = _find_after_label(lines, "Hours")
-            start_date = _find_after_label(lines, "Start date")
-            duration = _find_after_label(lines, "Duration")
-            positions_available = _find_after_label(lines, "Positions available")
+            found = _find_after_labels(lines, _SUMMARY_LABELS)
+            wage = found["Wage"]
+            training_course = found["Training course"]
+            hours = found["Hours"]
+            start_date = found["Start date"]
+            duration = found["Duration"]
+            positions_available = found["Positions available"]
 
             for ln in lines:
                 if "hours a week" in ln.lower():
                     hours_per_week = ln.strip()
                     break
 
-            if "Wage" in lines:
-                idx = lines.index("Wage")
-                summary_text = cleanup_lines("\n".join(lines[:idx]))
-
-            if "Wage" in lines and "Training course" in lines:
-                try:
-                    w_i = lines.index("Wage")
-                    end_i = lines.index("Training course")
-                    start_i = min(w_i + 2, len(lines))
-                    extra = []
-                    for ln in lines[start_i:end_i]:
-                        if "check minimum wage rates" in ln.lower():
-                            continue
-                        extra.append(ln)
-                    wage_extra = cleanup_lines("\n".join(extra))
-                except Exception:
-                    pass
+            # first exact "Wage" / "Training course" lines, from one scan
+            label_idx: Dict[str, int] = {}
+            for i, ln in enumerate(lines):
+                if ln in _SUMMARY_LABELS:
+                    label_idx.setdefault(ln, i)
+            w_i = label_idx.get("Wage")
+            end_i = label_idx.get("Training course")
+
+            if w_i is not None:
+                summary_text = cleanup_lines("\n".join(lines[:w_i]))
+
+            if w_i is not None and end_i is not None:
+                start_i = min(w_i + 2, len(lines))
+                extra = []
+                for ln in lines[start_i:end_i]:
+                    if "check minimum wage rates" in ln.lower():
+                        continue
+                    extra.append(ln)
+                wage_extra = cleanup_lines("\n".join(extra))
 
         # Work (robust intro + heading + items)
         work_intro = ""
@@ -523,10 +857,10 @@ class NcsApprenticeshipClient:
         where_youll_work_name = ""
         where_youll_work_address = ""
 
-        work_h2 = _find_h2(main, "Work")
-        if work_h2:
+        work_h2 = _find_heading(h2s, "Work")
+        if work_h2 is not None:
             work_scope = _collect_until_next_h2(work_h2)
-            work_lines = _lines(work_scope)
+            work_lines = _scope_lines(work_scope)
 
             idx_do = next((i for i, ln in enumerate(work_lines) if ln.lower() == "what you'll do at work"), None)
             if idx_do is not None:
@@ -534,13 +868,14 @@ class NcsApprenticeshipClient:
             else:
                 work_intro = cleanup_lines("\n".join(work_lines))
 
-            h3_do = _find_h3_in_scope(work_scope, "What you'll do at work")
-            do_scope = _collect_until_next_h3_or_h2(h3_do) if h3_do else work_scope
+            work_h3s = _heading_index(work_scope, "h3", "h4")
+            h3_do = _find_heading(work_h3s, "What you'll do at work")
+            do_scope = _collect_until_next_h3_or_h2(h3_do) if h3_do is not None else work_scope
 
             do_items_list = _bullet_items(do_scope)
             what_youll_do_items = "\n".join(do_items_list).strip()
 
-            do_lines = _lines(do_scope)
+            do_lines = work_lines if do_scope is work_scope else _scope_lines(do_scope)
             if do_lines and do_lines[0].lower() == "what you'll do at work":
                 do_lines = do_lines[1:]
             if do_lines:
@@ -549,10 +884,10 @@ class NcsApprenticeshipClient:
                     if cand.lower() not in ("where you'll work", "work"):
                         what_youll_do_heading = cand
 
-            h3_where = _find_h3_in_scope(work_scope, "Where you'll work")
-            if h3_where:
+            h3_where = _find_heading(work_h3s, "Where you'll work")
+            if h3_where is not None:
                 where_scope = _collect_until_next_h3_or_h2(h3_where)
-                where_lines = [clean(x) for x in where_scope.get_text("\n", strip=True).splitlines() if clean(x)]
+                where_lines = _clean_lines(_scope_text(where_scope, "\n"))
                 if where_lines:
                     where_youll_work_name = where_lines[0]
                     where_youll_work_address = "\n".join(where_lines[1:]).strip()
@@ -570,46 +905,49 @@ class NcsApprenticeshipClient:
         training_schedule = ""
         more_training_information = ""
 
-        training_h2 = _find_h2(main, "Training")
-        if training_h2:
+        training_h2 = _find_heading(h2s, "Training")
+        if training_h2 is not None:
             t_scope = _collect_until_next_h2(training_h2)
-            t_lines = _lines(t_scope)
+            # one text walk per scope: the intro and the line fallback both come from it
+            t_text = _scope_text(t_scope, "\n")
 
-            training_intro = cleanup_lines(t_scope.get_text("\n", strip=True))
+            training_intro = cleanup_lines(t_text)
 
-            h3_provider = _find_h3_in_scope(t_scope, "Training provider")
-            if h3_provider:
+            t_h3s = _heading_index(t_scope, "h3", "h4")
+            h3_provider = _find_heading(t_h3s, "Training provider")
+            if h3_provider is not None:
                 ps = _collect_until_next_h3_or_h2(h3_provider)
-                training_provider = clean(ps.get_text(" ", strip=True))
+                training_provider = clean(_scope_text(ps, " "))
 
-            h3_course = _find_h3_in_scope(t_scope, "Training course")
-            if h3_course:
+            h3_course = _find_heading(t_h3s, "Training course")
+            if h3_course is not None:
                 cs = _collect_until_next_h3_or_h2(h3_course)
-                c_lines = [clean(x) for x in cs.get_text("\n", strip=True).splitlines() if clean(x)]
+                c_lines = _clean_lines(_scope_text(cs, "\n"))
                 training_course_repeat = c_lines[0] if c_lines else ""
 
-            h3_learn = _find_h3_in_scope(t_scope, "What you'll learn")
-            if h3_learn:
+            h3_learn = _find_heading(t_h3s, "What you'll learn")
+            if h3_learn is not None:
                 ls = _collect_until_next_h3_or_h2(h3_learn)
                 what_youll_learn_items = _bullets_text(ls)
 
-            h3_sched = _find_h3_in_scope(t_scope, "Training schedule")
-            if h3_sched:
+            h3_sched = _find_heading(t_h3s, "Training schedule")
+            if h3_sched is not None:
                 ss = _collect_until_next_h3_or_h2(h3_sched)
-                training_schedule = cleanup_lines(ss.get_text("\n", strip=True))
+                training_schedule = cleanup_lines(_scope_text(ss, "\n"))
 
             # 1) <details> block
             more_training_information = _details_block_text(t_scope, "More training information")
 
             # 2) heading block
             if not more_training_information:
-                h3_more = _find_h3_in_scope(t_scope, "More training information")
-                if h3_more:
+                h3_more = _find_heading(t_h3s, "More training information")
+                if h3_more is not None:
                     ms = _collect_until_next_h3_or_h2(h3_more)
-                    more_training_information = cleanup_lines(ms.get_text("\n", strip=True))
+                    more_training_information = cleanup_lines(_scope_text(ms, "\n"))
 
             # 3) line fallback
             if not more_training_information:
+                t_lines = _lines_from_text(t_text)
                 more_training_information = _extract_block_after_label(t_lines, "More training information")
 
         # Requirements
@@ -617,42 +955,46 @@ class NcsApprenticeshipClient:
         skills_items = ""
         other_requirements_items = ""
 
-        req_h2 = _find_h2(main, "Requirements")
-        if req_h2:
+        req_h2 = _find_heading(h2s, "Requirements")
+        if req_h2 is not None:
             r_scope = _collect_until_next_h2(req_h2)
 
-            h3_ess = _find_h3_in_scope(r_scope, "Essential qualifications")
-            if h3_ess:
+            r_h3s = _heading_index(r_scope, "h3", "h4")
+            h3_ess = _find_heading(r_h3s, "Essential qualifications")
+            if h3_ess is not None:
                 es = _collect_until_next_h3_or_h2(h3_ess)
-                essential_qualifications = cleanup_lines(es.get_text("\n", strip=True))
+                essential_qualifications = cleanup_lines(_scope_text(es, "\n"))
 
-            h3_skills = _find_h3_in_scope(r_scope, "Skills")
-            if h3_skills:
+            h3_skills = _find_heading(r_h3s, "Skills")
+            if h3_skills is not None:
                 sk = _collect_until_next_h3_or_h2(h3_skills)
                 skills_items = _bullets_text(sk)
 
-            h3_other = _find_h3_in_scope(r_scope, "Other requirements")
-            if h3_other:
+            h3_other = _find_heading(r_h3s, "Other requirements")
+            if h3_other is not None:
                 ot = _collect_until_next_h3_or_h2(h3_other)
-                other_requirements_items = _bullets_text(ot) or cleanup_lines(ot.get_text("\n", strip=True))
+                other_requirements_items = _bullets_text(ot) or cleanup_lines(_scope_text(ot, "\n"))
 
         # About employer (✅ robust Employer website + benefits)
         about_employer = ""
         employer_website = ""
         company_benefits_items = ""
 
-        about_h2 = _find_h2(main, "About this employer")
-        if about_h2:
+        about_h2 = _find_heading(h2s, "About this employer")
+        if about_h2 is not None:
             a_scope = _collect_until_next_h2(about_h2)
-            a_lines = _lines(a_scope)
+            a_text = _scope_text(a_scope, "\n")
+            # only built if a line fallback below actually runs
+            a_lines: List[str] = []
 
-            about_employer = cleanup_lines(a_scope.get_text("\n", strip=True))
+            about_employer = cleanup_lines(a_text)
 
             # 1) <dl> pattern
             employer_website = _dl_value(a_scope, "Employer website")
 
             # 2) label/next lines pattern
             if not employer_website:
+                a_lines = a_lines or _lines_from_text(a_text)
                 tmp = _extract_block_after_label(a_lines, "Employer website")
                 employer_website = _first_link_or_domain_from_text(tmp) or _normalize_url(tmp)
 
@@ -661,26 +1003,28 @@ class NcsApprenticeshipClient:
                 employer_website = _first_external_href(a_scope)
 
             # Company benefits
-            h3_ben = _find_h3_in_scope(a_scope, "Company benefits")
-            if h3_ben:
+            a_h3s = _heading_index(a_scope, "h3", "h4")
+            h3_ben = _find_heading(a_h3s, "Company benefits")
+            if h3_ben is not None:
                 bs = _collect_until_next_h3_or_h2(h3_ben)
                 company_benefits_items = _bullets_text(bs)
             else:
+                a_lines = a_lines or _lines_from_text(a_text)
                 company_benefits_items = _extract_block_after_label(a_lines, "Company benefits")
 
         # After
         after_this_apprenticeship = ""
-        after_h2 = _find_h2(main, "After this apprenticeship")
-        if after_h2:
+        after_h2 = _find_heading(h2s, "After this apprenticeship")
+        if after_h2 is not None:
             af = _collect_until_next_h2(after_h2)
-            after_this_apprenticeship = _bullets_text(af) or cleanup_lines(af.get_text("\n", strip=True))
+            after_this_apprenticeship = _bullets_text(af) or cleanup_lines(_scope_text(af, "\n"))
 
         # Ask a question
         contact_name = ""
-        ask_h2 = _find_h2(main, "Ask a question")
-        if ask_h2:
+        ask_h2 = _find_heading(h2s, "Ask a question")
+        if ask_h2 is not None:
             ask_scope = _collect_until_next_h2(ask_h2)
-            ask_lines = [clean(x) for x in ask_scope.get_text("\n", strip=True).splitlines() if clean(x)]
+            ask_lines = _clean_lines(_scope_text(ask_scope, "\n"))
             for i, ln in enumerate(ask_lines):
                 if ln.lower().startswith("the contact for this apprenticeship is"):
                     if i + 1 < len(ask_lines):
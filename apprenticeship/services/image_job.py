@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
+import mimetypes
 import os
 from dataclasses import dataclass
 from typing import Optional, Tuple
@@ -9,12 +13,38 @@ from typing import Optional, Tuple
 import cloudinary
 import cloudinary.uploader
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# once per process instead of on every upload
+cloudinary.config(secure=True)
 
 
 class ImageGenerationError(RuntimeError):
     pass
 
 
+# One keep-alive session for every Gemini call (the scrape commands call this from a thread pool),
+# so each image after the first skips the TCP + TLS handshake.
+# POST is retried on 429/5xx too: generateContent has no side effects worth protecting.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("POST",),
+            # hand the last error response back so its body ends up in the error message
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
 def _get_api_key() -> str:
     key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if not key:
@@ -33,29 +63,42 @@ class GeneratedImage:
     data_b64: str
 
 
+# Fixed instructions first, vacancy-specific lines last: every prompt then shares the same
+# prefix, which is what Gemini's implicit prompt caching keys on.
+_PROMPT_HEADER = (
+    "Photorealistic lifestyle photo for a jobs/courses/apprenticeships recommendation app thumbnail.\n"
+    "\n"
+    "STYLE:\n"
+    "- Natural lighting, neutral white balance, true-to-life colors\n"
+    "- Clean, modern, realistic, no tint, no filters, no heavy grading\n"
+    "- Real-world candid scene, shallow depth of field\n"
+    "- Square 1:1 composition, centered subject\n\n"
+    "AVOID:\n"
+    "- Text, captions, letters, typography\n"
+    "- Logos, watermarks, brand names\n"
+    "- UI overlays, app screens, icons, badges\n"
+    "- Posters/signage with readable text\n"
+    "- Heavy color filters, tints, stylized grading, overlays\n"
+    "\n"
+)
+
+
 def build_apprenticeship_prompt(title: str, employer: str = "") -> str:
     title = " ".join((title or "").split())[:220]
     employer = " ".join((employer or "").split())[:220]
 
     return (
-        "Photorealistic lifestyle photo for a jobs/courses/apprenticeships recommendation app thumbnail.\n"
-        f"ROLE/THEME: {title}\n"
+        _PROMPT_HEADER
+        + f"ROLE/THEME: {title}\n"
         + (f"EMPLOYER CONTEXT: {employer}\n" if employer else "")
-        + "\n"
-        "STYLE:\n"
-        "- Natural lighting, neutral white balance, true-to-life colors\n"
-        "- Clean, modern, realistic, no tint, no filters, no heavy grading\n"
-        "- Real-world candid scene, shallow depth of field\n"
-        "- Square 1:1 composition, centered subject\n\n"
-        "AVOID:\n"
-        "- Text, captions, letters, typography\n"
-        "- Logos, watermarks, brand names\n"
-        "- UI overlays, app screens, icons, badges\n"
-        "- Posters/signage with readable text\n"
-        "- Heavy color filters, tints, stylized grading, overlays\n"
     )
 
 
+def prompt_hash(prompt: str) -> str:
+    """Key for ApprenticeshipImageCache: identical prompts reuse the image already uploaded."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
 def _gemini_generate_image(prompt: str, *, model: Optional[str] = None, timeout: int = 60) -> GeneratedImage:
     """
     Uses generateContent with image modality.
@@ -67,21 +110,16 @@ def _gemini_generate_image(prompt: str, *, model: Optional[str] = None, timeout:
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
     headers = {"x-goog-api-key": api_key, "Content-Type": "application/json"}
 
-    # Try IMAGE-only first; fallback TEXT+IMAGE
-    payloads = [
-        {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"responseModalities": ["IMAGE"]},
-        },
-        {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {"responseModalities": ["TEXT", "IMAGE"]},
-        },
-    ]
+    # same contents for both attempts; only the modalities change
+    contents = [{"parts": [{"text": prompt}]}]
 
     last_err = None
-    for payload in payloads:
-        resp = requests.post(url, json=payload, headers=headers, timeout=timeout)
+    # Try IMAGE-only first; fallback TEXT+IMAGE
+    for modalities in (["IMAGE"], ["TEXT", "IMAGE"]):
+        payload = {"contents": contents, "generationConfig": {"responseModalities": modalities}}
+        # serialized once here (compact, UTF-8) instead of by requests' json=; adapter retries resend these bytes
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        resp = _SESSION.post(url, data=body, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             last_err = f"Gemini HTTP {resp.status_code}: {resp.text[:900]}"
             continue
@@ -112,11 +150,11 @@ def upload_b64_to_cloudinary(
     overwrite: bool = True,
     invalidate: bool = True,
 ) -> str:
-    cloudinary.config(secure=True)
-
-    data_uri = f"data:{mime_type};base64,{data_b64}"
+    # Raw bytes as a (filename, data) multipart file rather than a data: URI string:
+    # no extra copy of the base64 text, and Cloudinary has nothing to decode.
+    filename = f"{public_id}{mimetypes.guess_extension(mime_type) or ''}"
     result = cloudinary.uploader.upload(
-        data_uri,
+        (filename, base64.b64decode(data_b64)),
         folder=folder,
         public_id=public_id,
         overwrite=overwrite,
@@ -133,16 +171,20 @@ def generate_apprenticeship_image_and_upload(
     employer_name: str = "",
     folder: str = "ncs_apprenticeships",
     model: Optional[str] = None,
+    public_id: Optional[str] = None,
 ) -> Tuple[str, str]:
     """
     Returns: (cloudinary_url, prompt_used)
+
+    Callers that share the URL through ApprenticeshipImageCache pass a public_id derived
+    from the prompt hash, so regenerating one vacancy never overwrites another's image.
     """
     prompt = build_apprenticeship_prompt(title=title, employer=employer_name)
     generated = _gemini_generate_image(prompt, model=model)
 
     cloud_url = upload_b64_to_cloudinary(
         generated.data_b64,
-        public_id=str(vacancy_ref),
+        public_id=public_id or str(vacancy_ref),
         folder=folder,
         mime_type=generated.mime_type or "image/png",
         overwrite=True,
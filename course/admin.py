@@ -1,6 +1,8 @@
 # course/admin.py
 
 from django.contrib import admin
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Trim
 from django.utils.html import format_html
 
 from course.models import NcsCourse, CourseScrapeLog
@@ -23,6 +25,15 @@ class CourseScrapeLogAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
 
+def _image_url(obj: NcsCourse) -> str:
+    # `_img` is annotated by NcsCourseAdmin.get_queryset; unsaved
+    # instances (add form) don't carry it.
+    url = getattr(obj, "_img", None)
+    if url is None:
+        url = (getattr(obj, "image_url", "") or "").strip()
+    return url
+
+
 @admin.register(NcsCourse)
 class NcsCourseAdmin(admin.ModelAdmin):
     list_display = (
@@ -172,16 +183,20 @@ class NcsCourseAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        # trimmed image_url computed once per row by the database, shared by the image columns
+        return super().get_queryset(request).annotate(_img=Trim(Coalesce("image_url", Value(""))))
+
     @admin.display(description="Image")
     def image_open_link(self, obj: NcsCourse):
-        url = (getattr(obj, "image_url", "") or "").strip()
+        url = _image_url(obj)
         if not url:
             return "-"
         return format_html('<a href="{}" target="_blank" rel="noopener">open</a>', url)
 
     @admin.display(description="Preview")
     def image_preview_thumb(self, obj: NcsCourse):
-        url = (getattr(obj, "image_url", "") or "").strip()
+        url = _image_url(obj)
         if not url:
             return "-"
         return format_html(
@@ -191,7 +206,7 @@ class NcsCourseAdmin(admin.ModelAdmin):
 
     @admin.display(description="Preview")
     def image_preview_large(self, obj: NcsCourse):
-        url = (getattr(obj, "image_url", "") or "").strip()
+        url = _image_url(obj)
         if not url:
             return "No image_url"
         return format_html(
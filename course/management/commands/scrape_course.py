@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import functools
 import json
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import urlencode
 
 from django.conf import settings
@@ -10,12 +14,22 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils import timezone
 
-from course.models import NcsCourse, CourseScrapeLog
+from course.models import CourseImageCache, NcsCourse, CourseScrapeLog
 from course.scrapper.ncs import NcsCourseClient
-from course.services.job_image import generate_course_image_and_upload
+from course.services.job_image import (
+    build_course_prompt,
+    generate_course_image_and_upload,
+    prompt_hash,
+)
 
 BASE_SEARCH_URL = "https://nationalcareers.service.gov.uk/find-a-course/searchcourse"
 
+# CourseScrapeLog rows are buffered and bulk-inserted instead of one INSERT per course;
+# so are the "skipped" bookkeeping writes for unchanged courses (one UPDATE per batch)
+LOG_BATCH_SIZE = 500
+# per-course progress lines are buffered too and written in one call per batch
+OUT_BATCH_SIZE = 50
+
 
 def _categories_json_path() -> Path:
     return Path(settings.BASE_DIR) / "course" / "categories" / "categories.json"
@@ -25,7 +39,8 @@ def _load_categories_file(path: Path) -> dict[str, list[str]]:
     if not path.exists():
         raise FileNotFoundError(f"categories.json not found at: {path}")
 
-    data = json.loads(path.read_text(encoding="utf-8"))
+    # bytes straight to json: no separate str copy, and a UTF-8 BOM (Windows editors) is accepted
+    data = json.loads(path.read_bytes())
     if not isinstance(data, dict):
         raise ValueError(
             "categories.json must be a JSON object like: "
@@ -65,26 +80,57 @@ def _is_acronym_search_term(term: str) -> bool:
     return len(t) <= 3 and t.isupper()
 
 
+# placeholder values the site shows instead of a real answer
+_EMPTYISH = frozenset({
+    "",
+    "-",
+    "—",
+    "n/a",
+    "na",
+    "not available",
+    "not applicable",
+    "tbc",
+    "to be confirmed",
+    "contact course provider",
+    "contact provider",
+})
+
+
 def _is_emptyish(val: str) -> bool:
-    v = (val or "").strip().lower()
-    if not v:
-        return True
-    return v in {
-        "-",
-        "—",
-        "n/a",
-        "na",
-        "not available",
-        "not applicable",
-        "tbc",
-        "to be confirmed",
-        "contact course provider",
-        "contact provider",
-    }
-
-
-def _model_field_names(model) -> set[str]:
-    return {f.name for f in model._meta.fields}
+    return (val or "").strip().lower() in _EMPTYISH
+
+
+# scraped NcsCourse columns and their max_length (None = TextField), in comparison order
+_FIELD_LIMITS = (
+    ("website", 1000),
+    ("course_name", 500),
+    ("course_type", 500),
+    ("learning_method", 255),
+    ("course_hours", 255),
+    ("course_stryd_time", 255),
+    ("course_qualification_level", 255),
+    ("course_description", None),
+    ("attendance_pattern", 255),
+    ("awarding_organization", 500),
+    ("who_this_course_is_for", None),
+    ("entry_reeq", None),
+    ("college_name", 500),
+    ("address", None),
+    ("email", 255),
+    ("phone", 255),
+    ("duration", 255),
+    ("cost", 255),
+    ("cost_description", None),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _model_field_names(model) -> frozenset[str]:
+    return frozenset(f.name for f in model._meta.fields)
+
+
+# detect once per process if NcsCourse has an image field
+IMAGE_FIELD = "image_url" if "image_url" in _model_field_names(NcsCourse) else None
 
 
 class Command(BaseCommand):
@@ -95,7 +141,12 @@ class Command(BaseCommand):
     )
 
     def add_arguments(self, parser):
-        parser.add_argument("--delay", type=float, default=0.7)
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.7,
+            help="Minimum seconds between request starts, shared by all --workers.",
+        )
         parser.add_argument(
             "--max-rows",
             type=int,
@@ -123,11 +174,94 @@ class Command(BaseCommand):
         parser.add_argument(
             "--refresh-images",
             action="store_true",
-            help="Regenerate and overwrite course image even if image_url already exists.",
+            help="Regenerate and overwrite course image even if image_url already exists (skipped while the image prompt is unchanged).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Course detail pages fetched concurrently (DB writes stay on the main thread).",
+        )
+        parser.add_argument(
+            "--image-workers",
+            type=int,
+            default=4,
+            help="Images generated/uploaded in the background while scraping continues.",
+        )
+        parser.add_argument(
+            "--http-cache",
+            type=str,
+            default="",
+            help="Optional: sqlite file caching fetched pages, so re-runs within --http-cache-ttl "
+                 "read them from disk instead of the site (handy for dev/retry loops).",
+        )
+        parser.add_argument(
+            "--http-cache-ttl",
+            type=float,
+            default=3600.0,
+            help="Seconds a page stays in --http-cache.",
         )
 
     def handle(self, *args, **opts):
-        client = NcsCourseClient(delay=float(opts["delay"]))
+        self._log_buffer: list[CourseScrapeLog] = []
+        # pks of unchanged courses and the run that checked them; see _flush_skipped
+        self._skipped_pks: list[int] = []
+        self._skipped_run_id = None
+        self._out_buffer: list[str] = []
+        self._workers = max(1, int(opts.get("workers") or 1))
+        self._pool = ThreadPoolExecutor(max_workers=self._workers)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, int(opts.get("image_workers") or 1)))
+        self._image_jobs: list[tuple[Future, dict]] = []
+        # prompt hash -> uploaded URL ("" = not cached), and generations still running,
+        # so courses with the same name share one Gemini call
+        self._image_urls: dict[str, str] = {}
+        self._image_inflight: dict[str, Future] = {}
+        # +1 connection for the listing pages fetched in the background
+        client = NcsCourseClient(
+            delay=float(opts["delay"]),
+            pool_size=self._workers + 1,
+            cache_path=str(opts.get("http_cache") or "").strip(),
+            cache_ttl=float(opts.get("http_cache_ttl") or 3600.0),
+        )
+        try:
+            self._run(opts, client)
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            client.close()
+            # normal runs have already drained; this only matters on an aborted run
+            self._image_pool.shutdown(wait=True, cancel_futures=True)
+            self._drain_images(wait=True)
+            # also on an aborted run, so the rows logged so far are kept
+            self._flush_logs()
+            self._flush_out()
+
+    def _prefetch_details(
+        self,
+        client: NcsCourseClient,
+        listings: Iterable,
+        seen_course_ids: set[str],
+    ) -> Iterator[tuple[object, Future]]:
+        """
+        Yield (listed, details_future) in listing order while keeping up to
+        --workers detail pages in flight. Only HTTP + parsing run in the pool.
+        """
+        pending: deque[tuple[object, Future]] = deque()
+        try:
+            for listed in listings:
+                if listed.course_id in seen_course_ids:
+                    continue
+                seen_course_ids.add(listed.course_id)
+                pending.append((listed, self._pool.submit(client.scrape_course_detail, listed.url)))
+                if len(pending) >= self._workers:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            # consumer stopped early (--max-rows): drop fetches nobody will read
+            for _, fut in pending:
+                fut.cancel()
+
+    def _run(self, opts: dict, client: NcsCourseClient) -> None:
         max_rows = int(opts["max_rows"])
         start_url_override = str(opts["start_url"]).strip()
 
@@ -142,11 +276,11 @@ class Command(BaseCommand):
         skipped_count = 0
         error_count = 0
 
+        # An exact set on purpose: a probabilistic filter's false positive would silently drop a
+        # course from the run, and even 50k ids is only a few MB here.
         seen_course_ids: set[str] = set()
 
-        # detect if NcsCourse has an image field
-        course_fields = _model_field_names(NcsCourse)
-        image_field = "image_url" if "image_url" in course_fields else None
+        image_field = IMAGE_FIELD
 
         def should_stop() -> bool:
             return (max_rows > 0) and ((created_count + updated_count) >= max_rows)
@@ -154,16 +288,14 @@ class Command(BaseCommand):
         # MODE A: start-url override
         if start_url_override:
             self.stdout.write(self.style.WARNING("Using --start-url override (categories.json ignored)."))
-            for listed in client.iter_all_courses(start_url=start_url_override):
+            listings = client.iter_all_courses(start_url=start_url_override)
+            for listed, details_future in self._prefetch_details(client, listings, seen_course_ids):
                 if should_stop():
                     break
-                if listed.course_id in seen_course_ids:
-                    continue
-                seen_course_ids.add(listed.course_id)
 
                 status = self._process_one(
-                    client=client,
                     listed=listed,
+                    details_future=details_future,
                     run_id=run_id,
                     category="",
                     subcategory="",
@@ -182,11 +314,13 @@ class Command(BaseCommand):
                 else:
                     error_count += 1
 
-                self.stdout.write(
+                self._out(
                     f"[{created_count + updated_count}{'/' + str(max_rows) if max_rows else ''}] "
                     f"{listed.course_id} ({status}) {listed.course_name}"
                 )
 
+            self._drain_images(wait=True)
+            self._flush_out()
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Done. run_id={run_id} created={created_count}, updated={updated_count}, "
@@ -227,16 +361,14 @@ class Command(BaseCommand):
                 self.stdout.write(f"\n[{q_idx}/{total_queries}] category={category_name!r}, subcategory={sub!r}")
                 self.stdout.write(f"  URL: {start_url}")
 
-                for listed in client.iter_all_courses(start_url=start_url):
+                listings = client.iter_all_courses(start_url=start_url)
+                for listed, details_future in self._prefetch_details(client, listings, seen_course_ids):
                     if should_stop():
                         break
-                    if listed.course_id in seen_course_ids:
-                        continue
-                    seen_course_ids.add(listed.course_id)
 
                     status = self._process_one(
-                        client=client,
                         listed=listed,
+                        details_future=details_future,
                         run_id=run_id,
                         category=category_name,
                         subcategory=sub,
@@ -255,11 +387,15 @@ class Command(BaseCommand):
                     else:
                         error_count += 1
 
-                    self.stdout.write(
+                    self._out(
                         f"[{created_count + updated_count}{'/' + str(max_rows) if max_rows else ''}] "
                         f"{listed.course_id} ({status}) {listed.course_name}"
                     )
 
+                self._drain_images(wait=True)
+                self._flush_logs()
+                self._flush_out()
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"Done. run_id={run_id} created={created_count}, updated={updated_count}, "
@@ -270,8 +406,8 @@ class Command(BaseCommand):
     def _process_one(
         self,
         *,
-        client: NcsCourseClient,
         listed,
+        details_future: Future,
         run_id,
         category: str,
         subcategory: str,
@@ -281,7 +417,7 @@ class Command(BaseCommand):
         image_field: str | None,
     ) -> str:
         try:
-            details = client.scrape_course_detail(listed.url)
+            details = details_future.result()
 
             # ---- Merge listing + details ----
             if not details.get("course_name"):
@@ -308,54 +444,70 @@ class Command(BaseCommand):
             if listed.listing_description and _is_emptyish(details.get("course_description", "")):
                 details["course_description"] = listed.listing_description
 
-            status, msg = self._upsert_smart(
+            status, msg, row = self._upsert_smart(
                 course_id=listed.course_id,
                 course_url=listed.url,
                 data=details,
                 category=category,
                 subcategory=subcategory,
                 run_id=run_id,
+                image_field=image_field,
             )
 
             # --- image generation step (does not change scrape status) ---
             if (not no_images) and image_field:
+                log_ctx = {
+                    "run_id": run_id,
+                    "category": category,
+                    "keyword": subcategory,
+                    "postcode": "",
+                    "distance": 0,
+                    "start_url": start_url,
+                    "course_id": listed.course_id,
+                }
                 try:
-                    obj = NcsCourse.objects.get(course_id=listed.course_id)
-                    existing_url = (getattr(obj, image_field) or "").strip()
+                    # the columns _upsert_smart just read/wrote, no second SELECT
+                    existing_url = (row[image_field] or "").strip()
 
                     if refresh_images or (not existing_url):
-                        name_for_img = (obj.course_name or listed.course_name or "").strip()
-                        if name_for_img:
-                            cloud_url, _prompt_used = generate_course_image_and_upload(
-                                course_id=str(obj.course_id),
-                                course_name=name_for_img,
-                                folder="ncs_courses",
-                            )
-                            cloud_url = (cloud_url or "").strip()
-                            if cloud_url and cloud_url != existing_url:
-                                setattr(obj, image_field, cloud_url)
-                                obj.save(update_fields=[image_field])
+                        name_for_img = (row["course_name"] or listed.course_name or "").strip()
+                        key = prompt_hash(build_course_prompt(name_for_img)) if name_for_img else ""
+                        # same prompt as the stored image: regenerating would only re-upload it
+                        if name_for_img and not (existing_url and row["last_image_prompt_hash"] == key):
+                            # --refresh-images asks for a new image, so it bypasses the cache
+                            cached_url = "" if refresh_images else self._cached_image_url(key)
+                            if cached_url:
+                                fields = {"last_image_prompt_hash": key}
+                                if cached_url != existing_url:
+                                    fields[image_field] = cached_url
+                                NcsCourse.objects.filter(pk=row["id"]).update(**fields)
+                            else:
+                                fut = self._image_inflight.get(key)
+                                if fut is None:
+                                    # Gemini + Cloudinary run in the background; _drain_images writes the URL
+                                    fut = self._image_pool.submit(
+                                        generate_course_image_and_upload,
+                                        course_id=str(listed.course_id),
+                                        course_name=name_for_img,
+                                        folder="ncs_courses",
+                                        # shared through CourseImageCache, so keyed by prompt, not course
+                                        public_id=f"p_{key}",
+                                    )
+                                    self._image_inflight[key] = fut
+                                self._image_jobs.append((fut, {
+                                    "pk": row["id"],
+                                    "image_field": image_field,
+                                    "existing_url": existing_url,
+                                    "prompt_hash": key,
+                                    "log_ctx": log_ctx,
+                                }))
 
                 except Exception as e:
-                    # don't fail the scrape if image generation fails
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Course image generation failed course_id={listed.course_id}: {e}"
-                        )
-                    )
-                    CourseScrapeLog.objects.create(
-                        run_id=run_id,
-                        category=category,
-                        keyword=subcategory,
-                        postcode="",
-                        distance=0,
-                        start_url=start_url,
-                        course_id=listed.course_id,
-                        status="image_error",
-                        message=str(e),
-                    )
+                    self._image_failed(log_ctx, e)
+
+            self._drain_images(wait=False)
 
-            CourseScrapeLog.objects.create(
+            self._log(
                 run_id=run_id,
                 category=category,
                 keyword=subcategory,
@@ -369,7 +521,7 @@ class Command(BaseCommand):
             return status
 
         except Exception as e:
-            CourseScrapeLog.objects.create(
+            self._log(
                 run_id=run_id,
                 category=category,
                 keyword=subcategory,
@@ -382,6 +534,87 @@ class Command(BaseCommand):
             )
             return "error"
 
+    def _drain_images(self, *, wait: bool) -> None:
+        """Store finished image uploads (main thread only). wait=True blocks on all pending jobs."""
+        pending: list[tuple[Future, dict]] = []
+        for fut, job in self._image_jobs:
+            if fut.cancelled():
+                continue
+            if not (wait or fut.done()):
+                pending.append((fut, job))
+                continue
+            key = job["prompt_hash"]
+            if self._image_inflight.get(key) is fut:
+                del self._image_inflight[key]
+            try:
+                cloud_url, _prompt_used = fut.result()
+                cloud_url = (cloud_url or "").strip()
+                if cloud_url:
+                    fields = {"last_image_prompt_hash": key}
+                    if cloud_url != job["existing_url"]:
+                        fields[job["image_field"]] = cloud_url
+                    NcsCourse.objects.filter(pk=job["pk"]).update(**fields)
+                # courses sharing one generation only store it once
+                if cloud_url and self._image_urls.get(key) != cloud_url:
+                    CourseImageCache.objects.update_or_create(prompt_hash=key, defaults={"cloud_url": cloud_url})
+                    self._image_urls[key] = cloud_url
+            except Exception as e:
+                self._image_failed(job["log_ctx"], e)
+        self._image_jobs = pending
+
+    def _cached_image_url(self, key: str) -> str:
+        url = self._image_urls.get(key)
+        if url is None:
+            url = (
+                CourseImageCache.objects.filter(prompt_hash=key)
+                .values_list("cloud_url", flat=True)
+                .first()
+            ) or ""
+            self._image_urls[key] = url
+        return url
+
+    def _image_failed(self, log_ctx: dict, e: Exception) -> None:
+        # don't fail the scrape if image generation fails
+        self._out(
+            self.style.WARNING(
+                f"Course image generation failed course_id={log_ctx['course_id']}: {e}"
+            )
+        )
+        self._log(**log_ctx, status="image_error", message=str(e))
+
+    def _log(self, **fields) -> None:
+        self._log_buffer.append(CourseScrapeLog(**fields))
+        if len(self._log_buffer) >= LOG_BATCH_SIZE:
+            self._flush_logs()
+
+    def _flush_skipped(self) -> None:
+        """One UPDATE for every buffered unchanged course instead of one per course."""
+        if self._skipped_pks:
+            NcsCourse.objects.filter(pk__in=self._skipped_pks).update(
+                last_checked_at=timezone.now(),
+                last_scrape_run_id=self._skipped_run_id,
+                last_scrape_status="skipped",
+                last_scrape_message="",
+            )
+            self._skipped_pks.clear()
+
+    def _flush_logs(self) -> None:
+        self._flush_skipped()
+        if self._log_buffer:
+            CourseScrapeLog.objects.bulk_create(self._log_buffer, batch_size=LOG_BATCH_SIZE)
+            self._log_buffer.clear()
+
+    def _out(self, line: str) -> None:
+        self._out_buffer.append(line)
+        if len(self._out_buffer) >= OUT_BATCH_SIZE:
+            self._flush_out()
+
+    def _flush_out(self) -> None:
+        if self._out_buffer:
+            # one write for the whole batch; ending="" since the joined text already ends in a newline
+            self.stdout.write("\n".join(self._out_buffer) + "\n", ending="")
+            self._out_buffer.clear()
+
     @transaction.atomic
     def _upsert_smart(
         self,
@@ -392,95 +625,69 @@ class Command(BaseCommand):
         category: str,
         subcategory: str,
         run_id,
-    ) -> tuple[str, str]:
+        image_field: str | None = None,
+    ) -> tuple[str, str, dict]:
+        """
+        Returns (status, message, row); row holds "id", "course_name" and the
+        image field, which is all the image step reads.
+        """
         now = timezone.now()
 
-        new_vals = {
-            "course_url": (course_url or "")[:1000],
-            "website": (data.get("website") or "")[:1000],
-            "course_name": (data.get("course_name") or "")[:500],
-            "course_type": (data.get("course_type") or "")[:500],
-            "learning_method": (data.get("learning_method") or "")[:255],
-            "course_hours": (data.get("course_hours") or "")[:255],
-            "course_stryd_time": (data.get("course_stryd_time") or "")[:255],
-            "course_qualification_level": (data.get("course_qualification_level") or "")[:255],
-            "course_description": data.get("course_description") or "",
-            "attendance_pattern": (data.get("attendance_pattern") or "")[:255],
-            "awarding_organization": (data.get("awarding_organization") or "")[:500],
-            "who_this_course_is_for": data.get("who_this_course_is_for") or "",
-            "entry_reeq": data.get("entry_reeq") or "",
-            "college_name": (data.get("college_name") or "")[:500],
-            "address": data.get("address") or "",
-            "email": (data.get("email") or "")[:255],
-            "phone": (data.get("phone") or "")[:255],
-            "duration": (data.get("duration") or "")[:255],
-            "cost": (data.get("cost") or "")[:255],
-            "cost_description": data.get("cost_description") or "",
-            "last_checked_at": now,
-            "last_scrape_run_id": run_id,
-        }
+        course_url = course_url or ""
+        new_vals = {"course_url": course_url if len(course_url) <= 1000 else course_url[:1000]}
+        for field, limit in _FIELD_LIMITS:
+            val = data.get(field) or ""
+            # slice only when it's too long: most scraped values fit as they are
+            new_vals[field] = val if limit is None or len(val) <= limit else val[:limit]
 
         if category:
             new_vals["category"] = category[:255]
         if subcategory:
             new_vals["subcategory"] = subcategory[:255]
 
-        obj, created = NcsCourse.objects.get_or_create(
-            course_id=course_id,
-            defaults=new_vals,
-        )
-
-        if created:
-            obj.last_scrape_status = "created"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=["last_scrape_status", "last_scrape_message"])
-            return "created", ""
-
-        changed_fields: list[str] = []
-
-        if category and not (obj.category or "").strip():
-            obj.category = category[:255]
-            changed_fields.append("category")
+        meta = {
+            "last_checked_at": now,
+            "last_scrape_run_id": run_id,
+        }
+        extra = (image_field, "last_image_prompt_hash") if image_field else ()
 
-        if subcategory and not (obj.subcategory or "").strip():
-            obj.subcategory = subcategory[:255]
-            changed_fields.append("subcategory")
+        # Read only the compared columns (+ what the image step needs); no model instance is built.
+        existing = (
+            NcsCourse.objects.filter(course_id=course_id)
+            .values("id", *new_vals, *extra)
+            .first()
+        )
 
-        for field, val in new_vals.items():
-            if field in ("last_checked_at", "last_scrape_run_id"):
-                continue
-            if getattr(obj, field) != val:
-                setattr(obj, field, val)
-                changed_fields.append(field)
-
-        obj.last_checked_at = now
-        obj.last_scrape_run_id = run_id
-
-        if not changed_fields:
-            obj.last_scrape_status = "skipped"
-            obj.last_scrape_message = ""
-            obj.save(
-                update_fields=[
-                    "last_checked_at",
-                    "last_scrape_run_id",
-                    "last_scrape_status",
-                    "last_scrape_message",
-                ]
+        if existing is None:
+            obj = NcsCourse.objects.create(
+                course_id=course_id,
+                **new_vals,
+                **meta,
+                last_scrape_status="created",
+                last_scrape_message="",
             )
-            return "skipped", ""
-
-        msg = f"changed_fields={','.join(changed_fields)}"
-        obj.last_scrape_status = "updated"
-        obj.last_scrape_message = msg
-
-        obj.save(
-            update_fields=changed_fields
-            + [
-                "scraped_at",
-                "last_checked_at",
-                "last_scrape_run_id",
-                "last_scrape_status",
-                "last_scrape_message",
-            ]
+            row = {"id": obj.pk, "course_name": obj.course_name}
+            row.update((f, getattr(obj, f)) for f in extra)
+            return "created", "", row
+
+        changed = {field: val for field, val in new_vals.items() if existing[field] != val}
+        courses = NcsCourse.objects.filter(pk=existing["id"])
+
+        if not changed:
+            self._skipped_pks.append(existing["id"])
+            self._skipped_run_id = run_id
+            if len(self._skipped_pks) >= LOG_BATCH_SIZE:
+                self._flush_skipped()
+            return "skipped", "", existing
+
+        msg = f"changed_fields={','.join(changed)}"
+        # .update() skips auto_now, so scraped_at is set here as save() used to
+        courses.update(
+            **changed,
+            **meta,
+            scraped_at=now,
+            last_scrape_status="updated",
+            last_scrape_message=msg,
         )
-        return "updated", msg
+        existing.update(changed)
+        return "updated", msg, existing
@@ -522,7 +522,7 @@ from django.db import connection, transaction
 from django.db.utils import OperationalError
 from django.utils import timezone
 
-from course.models import CourseScrapeLog, NcsCourse
+from course.models import CourseImageCache, CourseScrapeLog, NcsCourse
 from course.scrapper.ucas_courses import UcasCourseClient, UcasCourseListing
 
 
@@ -650,6 +650,8 @@ class Command(BaseCommand):
         max_pages = int(opts["max_pages"])
         no_images = bool(opts.get("no_images"))
         refresh_images = bool(opts.get("refresh_images"))
+        # prompt hash -> uploaded URL ("" = not cached): courses with the same name share one image
+        self._image_urls: dict[str, str] = {}
 
         run_id = uuid.uuid4()
         self.stdout.write(self.style.WARNING(f"run_id={run_id}"))
@@ -853,6 +855,17 @@ class Command(BaseCommand):
                 )
             return "error"
 
+    def _cached_image_url(self, key: str) -> str:
+        url = self._image_urls.get(key)
+        if url is None:
+            url = (
+                CourseImageCache.objects.filter(prompt_hash=key)
+                .values_list("cloud_url", flat=True)
+                .first()
+            ) or ""
+            self._image_urls[key] = url
+        return url
+
     def _maybe_generate_image(
         self,
         *,
@@ -867,25 +880,42 @@ class Command(BaseCommand):
         """Generate / refresh Cloudinary image if needed."""
         try:
             _ensure_db_connection()
-            obj = NcsCourse.objects.get(course_id=listed.course_id)
-            existing_url = (getattr(obj, image_field) or "").strip()
+            # only the columns this step reads; no model instance is built
+            row = (
+                NcsCourse.objects.filter(course_id=listed.course_id)
+                .values("pk", "course_id", "course_name", image_field)
+                .get()
+            )
+            existing_url = (row[image_field] or "").strip()
 
             if refresh_images or (not existing_url):
-                name_for_img = (obj.course_name or listed.course_name or "").strip()
+                name_for_img = (row["course_name"] or listed.course_name or "").strip()
                 if not name_for_img:
                     return
 
-                from course.services.job_image import generate_course_image_and_upload
-
-                cloud_url, _prompt_used = generate_course_image_and_upload(
-                    course_id=str(obj.course_id),
-                    course_name=name_for_img,
-                    folder="ucas_courses",
+                from course.services.job_image import (
+                    build_course_prompt,
+                    generate_course_image_and_upload,
+                    prompt_hash,
                 )
-                cloud_url = (cloud_url or "").strip()
+
+                key = prompt_hash(build_course_prompt(name_for_img))
+                # --refresh-images asks for a new image, so it bypasses the cache
+                cloud_url = "" if refresh_images else self._cached_image_url(key)
+                if not cloud_url:
+                    cloud_url, _prompt_used = generate_course_image_and_upload(
+                        course_id=str(row["course_id"]),
+                        course_name=name_for_img,
+                        folder="ucas_courses",
+                        # shared through CourseImageCache, so keyed by prompt, not course
+                        public_id=f"p_{key}",
+                    )
+                    cloud_url = (cloud_url or "").strip()
+                    if cloud_url:
+                        CourseImageCache.objects.update_or_create(prompt_hash=key, defaults={"cloud_url": cloud_url})
+                        self._image_urls[key] = cloud_url
                 if cloud_url and cloud_url != existing_url:
-                    setattr(obj, image_field, cloud_url)
-                    obj.save(update_fields=[image_field])
+                    NcsCourse.objects.filter(pk=row["pk"]).update(**{image_field: cloud_url})
 
         except Exception as e:
             self.stdout.write(
@@ -991,35 +1021,21 @@ class Command(BaseCommand):
                 setattr(obj, field, val)
                 changed_fields.append(field)
 
-        obj.last_checked_at = now
-        obj.last_scrape_run_id = run_id
+        meta = {"last_checked_at": now, "last_scrape_run_id": run_id}
+        # queryset .update(): one UPDATE, no save() signal dispatch / field bookkeeping
+        courses = NcsCourse.objects.filter(pk=obj.pk)
 
         if not changed_fields:
-            obj.last_scrape_status = "skipped"
-            obj.last_scrape_message = ""
-            obj.save(
-                update_fields=[
-                    "last_checked_at",
-                    "last_scrape_run_id",
-                    "last_scrape_status",
-                    "last_scrape_message",
-                ]
-            )
+            courses.update(**meta, last_scrape_status="skipped", last_scrape_message="")
             return "skipped", ""
 
         msg = f"changed_fields={','.join(changed_fields)}"
-        obj.last_scrape_status = "updated"
-        obj.last_scrape_message = msg
-        obj.scraped_at = now
-
-        obj.save(
-            update_fields=changed_fields
-            + [
-                "scraped_at",
-                "last_checked_at",
-                "last_scrape_run_id",
-                "last_scrape_status",
-                "last_scrape_message",
-            ]
+        # .update() skips auto_now, so scraped_at is set explicitly
+        courses.update(
+            **{field: getattr(obj, field) for field in changed_fields},
+            **meta,
+            scraped_at=now,
+            last_scrape_status="updated",
+            last_scrape_message=msg,
         )
         return "updated", msg
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0011_ncscourse_requirement_summery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseImageCache',
+            fields=[
+                ('prompt_hash', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('cloud_url', models.URLField(max_length=1000)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0012_courseimagecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ncscourse',
+            name='last_image_prompt_hash',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+    ]
@@ -40,6 +40,8 @@ class NcsCourse(models.Model):
 
     course_url = models.URLField(max_length=1000)
     image_url = models.URLField(max_length=1000, blank=True, default="")
+    # sha1 of the prompt behind image_url; an unchanged prompt skips regeneration
+    last_image_prompt_hash = models.CharField(max_length=40, blank=True, default="")
 
     course_name = models.CharField(max_length=500, blank=True, default="")
     course_type = models.CharField(max_length=500, blank=True, default="")
@@ -86,3 +88,13 @@ class NcsCourse(models.Model):
 
     def __str__(self) -> str:
         return f"{self.course_name} ({self.course_id})"
+
+
+class CourseImageCache(models.Model):
+    # sha1 of the Gemini prompt: courses with the same name share one generated image
+    prompt_hash = models.CharField(max_length=40, primary_key=True)
+    cloud_url = models.URLField(max_length=1000)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.prompt_hash} -> {self.cloud_url}"
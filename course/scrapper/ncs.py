@@ -2,34 +2,202 @@
 from __future__ import annotations
 
 import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
-from urllib.parse import parse_qs, urljoin, urlparse
+from urllib.parse import parse_qs, unquote_plus, urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+from lxml import etree
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+Element = etree._Element
+
 BASE = "https://nationalcareers.service.gov.uk"
 DETAILS_PATH = "/find-a-course/details"
 
-PUNCT_ONLY_RE = re.compile(r"^[\s,.;:–—-]+$")
-UI_SKIP_LINES = {
+UI_SKIP_LINES = frozenset({
     "hide",
     "show",
     "hide all sections",
     "show all sections",
     "find on google maps",
-}
+})
+# a line longer than this can't be a UI label, so it is never lower()-ed
+_UI_SKIP_MAX_LEN = max(map(len, UI_SKIP_LINES))
+
+# punctuation-only lines (was ^[\s,.;:–—-]+$): delete the punctuation, what's left must be whitespace
+_PUNCT_DELETE = str.maketrans("", "", ",.;:–—-")
+
+# detail-page boilerplate lines dropped from section text (matched lowercased, as prefixes)
+_BLOCK_DROP_PREFIXES = (
+    "table with course details",
+    "table with course venue details",
+    "discover the learning experience",
+    "find out what qualifications",
+)
 
 # Listing labels sometimes appear like "* Duration:" or "• Cost:"
 BULLET_PREFIX_RE = re.compile(r"^[\s•*\-–—·]+")
 
+WS_RE = re.compile(r"\s+")
+COST_NUMBER_RE = re.compile(r"\b\d{1,3}(,\d{3})*(\.\d+)?\b")
+
+# case-insensitive, so the value checks below never lower() a line
+# ("month" also covers "months", and so on)
+DURATION_UNIT_RE = re.compile(r"month|year|week|day", re.I)
+DURATION_MODE_RE = re.compile(r"full-time|part-time", re.I)
+COST_WORD_RE = re.compile(r"fee|cost", re.I)
+
+# "View course" links on cards; a longer line is never lower()-ed
+VIEW_LINES = frozenset({"view course", "view"})
+_VIEW_MAX_LEN = max(map(len, VIEW_LINES))
+
+# Listing card labels, compiled once: "Duration:", "Duration", "Duration: 12 Months", "Duration 12 Months"
+LISTING_LABELS = ("start date", "cost", "learning method", "duration")
+LABEL_RES = {
+    label: re.compile(rf"^{re.escape(label)}\s*:?\s*(.*)$", re.I) for label in LISTING_LABELS
+}
+LABEL_LINE_RE = re.compile(rf"^\s*(?:{'|'.join(map(re.escape, LISTING_LABELS))})", re.I)
+# any listing label anywhere in a card's text (case-sensitive, as the labels are rendered)
+CARD_MARKER_RE = re.compile(r"Cost|Duration|Learning method|Start date")
+
+
+# Listing pages are parsed with lxml directly (no bs4 wrapper objects); detail pages still use bs4.
+# visible text nodes only: script/style/template contents are not page text (as bs4's get_text)
+_TEXT_NODES = etree.XPath("descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+# compiled once; node.xpath("...") would re-compile the expression on every call
+_XP_COURSE_LINKS = etree.XPath(
+    f'.//a[contains(@href, "{DETAILS_PATH}")][contains(@href, "courseId=")]'
+)
+_XP_A_HREF = etree.XPath(".//a[@href]")
+
+# detail pages only need <main>: bs4 builds no objects for the header, nav, footer and scripts
+_MAIN_ONLY = SoupStrainer("main")
+
+# recover: tag soup is fine; huge_tree: no libxml2 size/depth caps on big listing pages
+_PARSER_OPTIONS = dict(recover=True, huge_tree=True, remove_pis=True)
+
 
 def clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return WS_RE.sub(" ", (s or "").strip())
+
+
+def _text(node: Element, sep: str = "") -> str:
+    """Same result as bs4's node.get_text(sep, strip=True)."""
+    return sep.join(t for t in (s.strip() for s in _TEXT_NODES(node)) if t)
+
+
+def _find_first(root: Element, tag: str) -> Optional[Element]:
+    return next(root.iterdescendants(tag), None)
+
+
+# 429 and 503 are not retried here: _get() handles them, waiting out Retry-After and
+# slowing the shared pacing (urllib3 would otherwise retry them on its own backoff)
+_RETRY = Retry(
+    total=5,
+    backoff_factor=0.6,
+    status_forcelist=(500, 502, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=False,
+)
+
+# adaptive pacing: each 429/503 doubles the request gap (up to THROTTLE_MAX_GAP),
+# every THROTTLE_RECOVER_AFTER successes in a row halve it back towards `delay`
+THROTTLE_MAX_GAP = 30.0
+THROTTLE_RECOVER_AFTER = 10
+THROTTLE_MAX_ATTEMPTS = 6
+THROTTLE_STATUSES = (429, 503)
+
+
+class HtmlCache:
+    """
+    On-disk (sqlite) cache of fetched pages, keyed by URL, each entry valid for `ttl` seconds.
+    Meant for dev/retry loops: re-running a scrape inside the TTL reads the pages back from
+    disk instead of downloading them again. Safe to share between the client's threads.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS html_cache ("
+                "url TEXT PRIMARY KEY, fetched_at REAL NOT NULL, content_type TEXT NOT NULL, body BLOB NOT NULL)"
+            )
+            # drop what has expired since the last run, so the file doesn't only ever grow
+            self._db.execute("DELETE FROM html_cache WHERE fetched_at < ?", (time.time() - ttl,))
+
+    def get(self, url: str) -> Optional[requests.Response]:
+        """The cached response for url, or None if it isn't cached (or has expired)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_type, body FROM html_cache WHERE url = ? AND fetched_at >= ?",
+                (url, time.time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        content_type, body = row
+        # rebuilt so r.text / _parse_html decode it exactly as they would the live response
+        r = requests.Response()
+        r.status_code = 200
+        r.url = url
+        r._content = body
+        if content_type:
+            r.headers["Content-Type"] = content_type
+        r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+        return r
+
+    def put(self, url: str, r: requests.Response) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO html_cache (url, fetched_at, content_type, body) VALUES (?, ?, ?, ?)",
+                (url, time.time(), r.headers.get("Content-Type") or "", r.content),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _parse_html(r: requests.Response) -> Element:
+    # same charset requests would use for r.text when the server sends one;
+    # otherwise lxml reads <meta charset> itself
+    content_type = (r.headers.get("Content-Type") or "").lower()
+    try:
+        parser = etree.HTMLParser(encoding=r.encoding if "charset=" in content_type else None, **_PARSER_OPTIONS)
+    except LookupError:
+        # charset name libxml2 doesn't know: let it sniff <meta charset> instead
+        parser = etree.HTMLParser(**_PARSER_OPTIONS)
+    root = etree.fromstring(r.content, parser) if r.content.strip() else None
+    # empty / whitespace-only body
+    return root if root is not None else etree.Element("html")
+
+
+# courseId (preferred) / courseID query parameters; a blank value doesn't count, as with parse_qs
+_COURSE_ID_RES = (
+    re.compile(r"(?:^|&)courseId=([^&]+)"),
+    re.compile(r"(?:^|&)courseID=([^&]+)"),
+)
+
+
+def _course_id_from_href(href: str) -> str:
+    """The courseId parse_qs(urlparse(href).query) would give, without building the query dict."""
+    query = href.partition("?")[2].partition("#")[0]
+    if "courseI" not in query:
+        return ""
+    for pattern in _COURSE_ID_RES:
+        m = pattern.search(query)
+        if m:
+            return unquote_plus(m.group(1))
+    return ""
 
 
 def abs_url(href: str, base: str = BASE) -> str:
@@ -41,6 +209,13 @@ def get_qs(url: str) -> Dict[str, str]:
     return {k: (v[0] if v else "") for k, v in q.items()}
 
 
+def _is_noise_line(ln: str) -> bool:
+    """Punctuation-only or UI chrome line. `ln` must already be stripped and non-empty."""
+    if not ln.translate(_PUNCT_DELETE).strip():
+        return True
+    return len(ln) <= _UI_SKIP_MAX_LEN and ln.lower() in UI_SKIP_LINES
+
+
 def cleanup_lines(text: str) -> str:
     lines = [ln.strip() for ln in (text or "").splitlines()]
     out: List[str] = []
@@ -49,9 +224,7 @@ def cleanup_lines(text: str) -> str:
             if out and out[-1] != "":
                 out.append("")
             continue
-        if PUNCT_ONLY_RE.match(ln):
-            continue
-        if ln.strip().lower() in UI_SKIP_LINES:
+        if _is_noise_line(ln):
             continue
         out.append(ln)
     return "\n".join(out).strip()
@@ -61,27 +234,25 @@ def _norm_line(ln: str) -> str:
     return BULLET_PREFIX_RE.sub("", (ln or "")).strip()
 
 
+def _is_view_line(t: str) -> bool:
+    return len(t) <= _VIEW_MAX_LEN and t.lower() in VIEW_LINES
+
+
 def _looks_like_duration_value(t: str) -> bool:
-    low = (t or "").lower()
-    if any(x in low for x in ("month", "months", "year", "years", "week", "weeks", "day", "days")) and any(
-        ch.isdigit() for ch in low
-    ):
+    t = t or ""
+    if DURATION_UNIT_RE.search(t) and any(ch.isdigit() for ch in t):
         return True
-    if "full-time" in low or "part-time" in low:
-        return True
-    return False
+    return DURATION_MODE_RE.search(t) is not None
 
 
 def _looks_like_cost_value(t: str) -> bool:
-    low = (t or "").lower()
+    t = t or ""
     if "£" in t:
         return True
-    if re.search(r"\b\d{1,3}(,\d{3})*(\.\d+)?\b", t) and ("fee" in low or "cost" in low):
-        return True
-    return False
+    return bool(COST_NUMBER_RE.search(t) and COST_WORD_RE.search(t))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListedCourse:
     course_id: str
     url: str
@@ -106,43 +277,137 @@ class NcsCourseClient:
       ✅ Details page has BOTH Cost and Cost description -> kept separate
     """
 
-    def __init__(self, *, delay: float = 0.7, timeout: int = 30) -> None:
+    def __init__(
+        self,
+        *,
+        delay: float = 0.7,
+        timeout: int = 30,
+        pool_size: int = 10,
+        cache_path: str = "",
+        cache_ttl: float = 3600.0,
+    ) -> None:
         self.delay = delay
         self.timeout = timeout
+        # optional: serve pages fetched within the last cache_ttl seconds from disk
+        self.cache = HtmlCache(cache_path, ttl=cache_ttl) if cache_path else None
 
         self.sess = requests.Session()
         self.sess.headers.update({"User-Agent": "Mozilla/5.0 (compatible; DjangoScraper/1.0)"})
 
-        retry = Retry(
-            total=5,
-            backoff_factor=0.6,
-            status_forcelist=(429, 500, 502, 503, 504),
-            allowed_methods=("GET",),
-        )
-        self.sess.mount("https://", HTTPAdapter(max_retries=retry))
-        self.sess.mount("http://", HTTPAdapter(max_retries=retry))
-
-    def soup(self, url: str) -> BeautifulSoup:
-        r = self.sess.get(url, timeout=self.timeout)
+        # one keep-alive connection per concurrent caller (listing prefetch, detail page workers),
+        # otherwise urllib3 drops the surplus connections after each request
+        adapter = HTTPAdapter(max_retries=_RETRY, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.sess.mount("https://", adapter)
+        self.sess.mount("http://", adapter)
+
+        # `delay` is the minimum gap between request starts, shared by every thread using
+        # this client, rather than a sleep after each response: the wait overlaps with the
+        # request/parse time. The gap grows while the site answers 429/503 and shrinks back once it stops.
+        self._pace_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._gap = delay
+        self._ok_streak = 0
+
+    def _pace(self) -> None:
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._gap
+        if wait > 0:
+            time.sleep(wait)
+
+    def _throttled(self, r: requests.Response) -> None:
+        try:
+            retry_after = _RETRY.parse_retry_after(r.headers.get("Retry-After") or "0")
+        except Exception:
+            retry_after = 0.0
+        with self._pace_lock:
+            self._ok_streak = 0
+            self._gap = min(max(self._gap * 2, 1.0), THROTTLE_MAX_GAP)
+            self._next_request_at = max(self._next_request_at, time.monotonic() + retry_after)
+
+    def _succeeded(self) -> None:
+        with self._pace_lock:
+            if self._gap <= self.delay:
+                return
+            self._ok_streak += 1
+            if self._ok_streak >= THROTTLE_RECOVER_AFTER:
+                self._ok_streak = 0
+                half = self._gap / 2
+                # snap back once close, so delay=0 really returns to 0
+                self._gap = half if half > max(self.delay, 0.1) else self.delay
+
+    def close(self) -> None:
+        self.sess.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _get(self, url: str) -> requests.Response:
+        """GET url, or its cached copy (no request, no pacing); 429/503s widen the shared gap and are retried."""
+        if self.cache is not None:
+            r = self.cache.get(url)
+            if r is not None:
+                return r
+        for _ in range(THROTTLE_MAX_ATTEMPTS):
+            self._pace()
+            r = self.sess.get(url, timeout=self.timeout)
+            if r.status_code not in THROTTLE_STATUSES:
+                break
+            self._throttled(r)
         r.raise_for_status()
-        time.sleep(self.delay)
+        self._succeeded()
+        if self.cache is not None:
+            self.cache.put(url, r)
+        return r
+
+    def soup(self, url: str, *, main_only: bool = False) -> BeautifulSoup:
+        r = self._get(url)
+        if main_only:
+            s = BeautifulSoup(r.text, "lxml", parse_only=_MAIN_ONLY)
+            if s.find("main") is not None:
+                return s
+            # no <main> on the page: callers fall back to the whole document
         return BeautifulSoup(r.text, "lxml")
 
+    def page(self, url: str) -> Element:
+        """GET + parse straight into an lxml tree (listing pages)."""
+        return _parse_html(self._get(url))
+
     # ---------------- Pagination ----------------
-    def iter_pages(self, start_url: str) -> Iterable[Tuple[str, BeautifulSoup]]:
-        seen = set()
+    def iter_pages(self, start_url: str) -> Iterable[Tuple[str, Element]]:
+        """
+        Follow "Next" links from start_url. The next page is fetched in the background
+        while the caller works through the current one (pages are still requested one
+        at a time: each next URL is only known once its previous page is parsed).
+        """
+        if not start_url:
+            return
+        seen = {start_url}
         url = start_url
-        while url and url not in seen:
-            seen.add(url)
-            s = self.soup(url)
-            yield url, s
-            url = self._next_url(s, current=url)
-
-    def _next_url(self, soup: BeautifulSoup, *, current: str) -> Optional[str]:
-        main = soup.find("main") or soup
-        for a in main.select("a[href]"):
-            if clean(a.get_text()).lower().startswith("next"):
-                return abs_url(a["href"], base=current)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            fut = pool.submit(self.page, url)
+            try:
+                while fut is not None:
+                    s = fut.result()
+                    nxt = self._next_url(s, current=url)
+                    fut = None
+                    if nxt and nxt not in seen:
+                        seen.add(nxt)
+                        fut = pool.submit(self.page, nxt)
+                    yield url, s
+                    url = nxt
+            finally:
+                # consumer stopped early: don't wait on a page nobody will read
+                if fut is not None:
+                    fut.cancel()
+
+    def _next_url(self, root: Element, *, current: str) -> Optional[str]:
+        main = _find_first(root, "main")
+        if main is None:
+            main = root
+        for a in _XP_A_HREF(main):
+            if clean("".join(_TEXT_NODES(a))).lower().startswith("next"):
+                return abs_url(a.get("href"), base=current)
         return None
 
     # ---------------- Listing ----------------
@@ -151,39 +416,46 @@ class NcsCourseClient:
             for c in self._extract_courses_from_list(page):
                 yield c
 
-    def _extract_courses_from_list(self, soup: BeautifulSoup) -> List[ListedCourse]:
-        main = soup.find("main") or soup
+    def _extract_courses_from_list(self, root: Element) -> List[ListedCourse]:
+        main = _find_first(root, "main")
+        if main is None:
+            main = root
         out: List[ListedCourse] = []
+        # a course is marked seen only once its card was found, so a later link can still supply it
+        seen: set[str] = set()
+        # cards can sit above <main>, so count links across the whole document
+        ids_by_node = self._course_ids_by_node(root.getroottree().getroot())
 
-        for a in main.select(f'a[href*="{DETAILS_PATH}"][href*="courseId="]'):
+        for a in _XP_COURSE_LINKS(main):
             href = a.get("href") or ""
             if not href:
                 continue
 
             url = abs_url(href)
-            qs = get_qs(url)
-            course_id = qs.get("courseId") or qs.get("courseID") or ""
-            if not course_id:
+            course_id = _course_id_from_href(href)
+            if not course_id or course_id in seen:
                 continue
 
-            card = self._find_result_card(a, course_id=course_id)
-            if not card:
+            card = self._find_result_card(a, course_id=course_id, ids_by_node=ids_by_node)
+            if card is None:
                 continue
 
-            card_lines = self._card_lines(card)
+            seen.add(course_id)
+            card_lines, content = self._card_lines(card)
 
-            course_name = self._pick_course_name(card, fallback="")
-            course_type = self._pick_course_type(card_lines, course_name)
+            course_name = self._pick_course_name(card, content, fallback="")
+            course_type = self._pick_course_type(content, course_name)
 
-            start_date = self._find_after_label(card_lines, "Start date")
-            cost = self._find_after_label(card_lines, "Cost")
-            learning_method = self._find_after_label(card_lines, "Learning method")
-            duration = self._find_after_label(card_lines, "Duration")
+            labels = self._label_values(card_lines)
+            start_date = labels.get("start date", "")
+            cost = labels.get("cost", "")
+            learning_method = labels.get("learning method", "")
+            duration = labels.get("duration", "")
 
-            town, provider = self._pick_town_provider(card_lines, course_name, course_type)
+            town, provider = self._pick_town_provider(content, course_name, course_type)
 
             listing_description = self._pick_listing_description(
-                card_lines,
+                content,
                 course_name=course_name,
                 course_type=course_type,
                 town=town,
@@ -206,150 +478,129 @@ class NcsCourseClient:
                 )
             )
 
-        # dedup by course_id
-        seen = set()
-        dedup: List[ListedCourse] = []
-        for c in out:
-            if c.course_id not in seen:
-                seen.add(c.course_id)
-                dedup.append(c)
-        return dedup
-
-    def _course_ids_in_node(self, node: Tag) -> set[str]:
-        ids: set[str] = set()
-        for a in node.select(f'a[href*="{DETAILS_PATH}"][href*="courseId="]'):
-            href = a.get("href") or ""
-            if not href:
+        return out
+
+    def _course_ids_by_node(self, root: Element) -> Dict[Element, set[str]]:
+        """
+        Course ids linked from inside each element, built bottom-up in one pass
+        over the page's course links (replaces a subtree search per climb step).
+        """
+        ids_by_node: Dict[Element, set[str]] = {}
+        for a in _XP_COURSE_LINKS(root):
+            cid = _course_id_from_href(a.get("href") or "")
+            if not cid:
                 continue
-            q = parse_qs(urlparse(href).query)
-            cid = ""
-            if q.get("courseId"):
-                cid = q["courseId"][0]
-            elif q.get("courseID"):
-                cid = q["courseID"][0]
-            if cid:
-                ids.add(cid)
-        return ids
-
-    def _find_result_card(self, link: Tag, *, course_id: str) -> Optional[Tag]:
-        node: Optional[Tag] = link
+            for anc in a.iterancestors():
+                ids_by_node.setdefault(anc, set()).add(cid)
+        return ids_by_node
+
+    def _find_result_card(
+        self, link: Element, *, course_id: str, ids_by_node: Dict[Element, set[str]]
+    ) -> Optional[Element]:
+        node: Optional[Element] = link
         for _ in range(15):
-            if not isinstance(node, Tag):
+            if node is None:
                 return None
 
-            ids = self._course_ids_in_node(node)
+            ids = ids_by_node.get(node)
             if ids and ids == {course_id}:
-                txt = node.get_text(" ", strip=True)
-                hits = sum(
-                    1 for lab in ("Cost", "Duration", "Learning method", "Start date")
-                    if lab in txt
-                )
-                if hits >= 1 or node.name in ("article", "li", "section"):
+                # the tag test first: a card element never needs its text collected
+                if node.tag in ("article", "li", "section") or CARD_MARKER_RE.search(_text(node, " ")):
                     return node
 
-            node = node.parent if isinstance(node.parent, Tag) else None
+            node = node.getparent()
         return None
 
-    def _card_lines(self, card: Tag) -> List[str]:
-        raw = card.get_text("\n", strip=True)
-        lines = [ln.strip() for ln in raw.splitlines() if ln.strip()]
-        return [
-            ln
-            for ln in lines
-            if ln.lower() not in UI_SKIP_LINES and not PUNCT_ONLY_RE.match(ln)
-        ]
-
-    def _is_label_line(self, t: str) -> bool:
-        low = (t or "").lower().strip()
-        return (
-            low.startswith("start date")
-            or low.startswith("cost")
-            or low.startswith("learning method")
-            or low.startswith("duration")
-        )
+    def _card_lines(self, card: Element) -> Tuple[List[str], List[str]]:
+        """
+        One pass over the card text -> (lines, content).
 
-    # ✅ FIX: works when label+value are split across lines:
-    #   "Duration:" then next line "12 Months"
-    def _find_after_label(self, lines: List[str], label: str) -> str:
-        base = label.strip().rstrip(":").lower()
-
-        for i, ln in enumerate(lines):
+        lines: every non-noise line, bullet prefix removed (read by _label_values).
+        content: the subset the pickers read, without labels, duration/cost values and
+        "view" links. A line that was only a bullet is kept as "" in both, since the
+        course-name fallback takes the first content line even if it is empty.
+        """
+        lines: List[str] = []
+        content: List[str] = []
+        for ln in _text(card, "\n").splitlines():
+            ln = ln.strip()
+            if not ln or _is_noise_line(ln):
+                continue
             t = _norm_line(ln)
-            if not t:
+            lines.append(t)
+            if self._is_label_line(t):
                 continue
-
-            # match: "Duration:", "Duration", "Duration: 12 Months", "Duration 12 Months"
-            m = re.match(rf"^{re.escape(base)}\s*:?\s*(.*)$", t, flags=re.I)
-            if not m:
+            if _looks_like_duration_value(t) or _looks_like_cost_value(t):
                 continue
+            if _is_view_line(t):
+                continue
+            content.append(t)
+        return lines, content
 
-            inline_val = clean(m.group(1))
-            if inline_val:
-                return inline_val
-
-            # fallback: value on next line
-            if i + 1 < len(lines):
-                nxt = _norm_line(lines[i + 1])
-                if nxt and not self._is_label_line(nxt):
-                    return clean(nxt)
-
-            return ""
-
-        return ""
+    def _is_label_line(self, t: str) -> bool:
+        return bool(LABEL_LINE_RE.match(t or ""))
 
-    def _pick_course_name(self, card: Optional[Tag], fallback: str = "") -> str:
-        if not card:
+    # ✅ FIX: works when label+value are split across lines:
+    #   "Duration:" then next line "12 Months"
+    def _label_values(self, lines: List[str]) -> Dict[str, str]:
+        """
+        Value of each LISTING_LABELS label found in the (normalized) card lines, in one scan.
+        The first line carrying a label decides its value: inline ("Cost: £0"), else the
+        next line unless that is another label ("Cost" / "£0"), else "".
+        """
+        found: Dict[str, str] = {}
+        for i, t in enumerate(lines):
+            # every label pattern also matches LABEL_LINE_RE, so other lines are skipped cheaply
+            if not t or not LABEL_LINE_RE.match(t):
+                continue
+            for label, label_re in LABEL_RES.items():
+                if label in found:
+                    continue
+                m = label_re.match(t)
+                if not m:
+                    continue
+
+                val = clean(m.group(1))
+                # fallback: value on next line
+                if not val and i + 1 < len(lines):
+                    nxt = lines[i + 1]
+                    if nxt and not self._is_label_line(nxt):
+                        val = clean(nxt)
+                found[label] = val
+        return found
+
+    def _pick_course_name(
+        self, card: Optional[Element], content: List[str], fallback: str = ""
+    ) -> str:
+        if card is None:
             return fallback
 
-        for h in card.find_all(["h2", "h3", "h4"]):
-            t = clean(h.get_text(" ", strip=True))
-            if t and t.lower() not in ("view course", "view"):
+        for h in card.iterdescendants("h2", "h3", "h4"):
+            t = clean(_text(h, " "))
+            if t and not _is_view_line(t):
                 return t
 
-        lines = self._card_lines(card)
-        for ln in lines:
-            t = _norm_line(ln)
-            if self._is_label_line(t):
-                continue
-            if _looks_like_duration_value(t) or _looks_like_cost_value(t):
-                continue
-            if t.lower() in ("view course", "view"):
-                continue
-            return t
-        return fallback
+        return content[0] if content else fallback
 
-    def _pick_course_type(self, lines: List[str], course_name: str) -> str:
-        for ln in lines:
-            t = _norm_line(ln)
+    # the pickers below take the `content` list from _card_lines(): labels, duration/cost values
+    # (✅ so a duration never becomes course_type) and "view" links are already gone
+    def _pick_course_type(self, content: List[str], course_name: str) -> str:
+        for t in content:
             if not t:
                 continue
             if t == course_name:
                 continue
-            if self._is_label_line(t):
-                continue
-            # ✅ prevent duration value becoming course_type
-            if _looks_like_duration_value(t) or _looks_like_cost_value(t):
-                continue
-            if t.lower() in ("view course", "view"):
-                continue
             if "," in t and len(t) < 140:
                 return t.strip().strip(",")
         return ""
 
-    def _pick_town_provider(self, lines: List[str], course_name: str, course_type: str) -> Tuple[str, str]:
+    def _pick_town_provider(self, content: List[str], course_name: str, course_type: str) -> Tuple[str, str]:
         candidates: List[str] = []
-        for ln in lines:
-            t = _norm_line(ln)
+        for t in content:
             if not t:
                 continue
             if t in (course_name, course_type):
                 continue
-            if self._is_label_line(t):
-                continue
-            if _looks_like_duration_value(t) or _looks_like_cost_value(t):
-                continue
-            if t.lower() in ("view course", "view"):
-                continue
             candidates.append(t)
 
         town = candidates[0] if len(candidates) >= 1 else ""
@@ -358,7 +609,7 @@ class NcsCourseClient:
 
     def _pick_listing_description(
         self,
-        lines: List[str],
+        content: List[str],
         *,
         course_name: str,
         course_type: str,
@@ -366,25 +617,18 @@ class NcsCourseClient:
         provider: str,
     ) -> str:
         skip = {course_name, course_type, town, provider}
-        for ln in lines:
-            t = _norm_line(ln)
+        for t in content:
             if not t:
                 continue
             if t in skip:
                 continue
-            if self._is_label_line(t):
-                continue
-            if _looks_like_duration_value(t) or _looks_like_cost_value(t):
-                continue
-            if t.lower() in ("view course", "view"):
-                continue
             if len(t) >= 20:
                 return t
         return ""
 
     # ---------------- Details ----------------
     def scrape_course_detail(self, course_url: str) -> Dict[str, str]:
-        s = self.soup(course_url)
+        s = self.soup(course_url, main_only=True)
         main = s.find("main") or s
 
         h1 = main.find("h1")
@@ -523,8 +767,7 @@ class NcsCourseClient:
             return ""
 
         if sec.name in ("h2", "h3"):
-            scope = self._collect_until_next_h2(sec)
-            return self._clean_block_text(scope.get_text("\n", strip=True))
+            return self._clean_block_text(self._text_until_next_h2(sec))
 
         return self._clean_block_text(sec.get_text("\n", strip=True))
 
@@ -533,55 +776,69 @@ class NcsCourseClient:
         if not sec:
             return {}
 
-        scope = self._collect_until_next_h2(sec) if sec.name in ("h2", "h3") else sec
+        scopes = self._tags_until_next_h2(sec) if sec.name in ("h2", "h3") else [sec]
 
-        table = scope.find("table") if scope else None
+        table = self._find_in(scopes, "table")
         if table:
             return self._parse_table(table)
 
-        dl = scope.find("dl") if scope else None
+        dl = self._find_in(scopes, "dl")
         if dl:
             return self._parse_dl(dl)
 
         return {}
 
-    def _collect_until_next_h2(self, start_h: Tag) -> Tag:
-        tmp = BeautifulSoup("<div></div>", "lxml").div  # type: ignore
+    # The section after an h2/h3 heading is read in place from its siblings. Copying them
+    # into a scratch soup moved them out of the page, so a second lookup of the same section,
+    # or of a heading nested inside it, came back empty.
+    def _tags_until_next_h2(self, start_h: Tag) -> List[Tag]:
+        tags: List[Tag] = []
+        for sib in start_h.next_siblings:
+            if isinstance(sib, Tag):
+                if sib.name == "h2":
+                    break
+                tags.append(sib)
+        return tags
+
+    def _text_until_next_h2(self, start_h: Tag) -> str:
+        parts: List[str] = []
         for sib in start_h.next_siblings:
-            if isinstance(sib, Tag) and sib.name == "h2":
-                break
             if isinstance(sib, Tag):
-                tmp.append(sib)
-        return tmp  # type: ignore
+                if sib.name == "h2":
+                    break
+                parts.append(sib.get_text("\n", strip=True))
+            # plain text only: comments / CDATA are NavigableString subclasses
+            elif type(sib) is NavigableString:
+                parts.append(sib.strip())
+        return "\n".join(p for p in parts if p)
+
+    @staticmethod
+    def _find_in(tags: List[Tag], name: str) -> Optional[Tag]:
+        """First `name` element at or under any of tags, in document order."""
+        for tag in tags:
+            found = tag if tag.name == name else tag.find(name)
+            if found is not None:
+                return found
+        return None
 
     def _clean_block_text(self, raw: str) -> str:
         if not raw:
             return ""
 
-        drop_prefixes = (
-            "table with course details",
-            "table with course venue details",
-            "discover the learning experience",
-            "find out what qualifications",
-        )
-
         lines: List[str] = []
         for ln in raw.splitlines():
             t = ln.strip()
             if not t:
                 continue
-
-            low = t.lower()
-            if low in UI_SKIP_LINES:
-                continue
-            if PUNCT_ONLY_RE.match(t):
+            if _is_noise_line(t):
                 continue
-            if any(low.startswith(p) for p in drop_prefixes):
+            if t.lower().startswith(_BLOCK_DROP_PREFIXES):
                 continue
 
             lines.append(t)
 
-        return cleanup_lines("\n".join(lines))
+        # already stripped, non-empty and noise-free: cleanup_lines() would return it unchanged
+        return "\n".join(lines)
 
     # ---------------- Table parsers ----------------
     def _parse_table(self, table: Tag) -> Dict[str, str]:
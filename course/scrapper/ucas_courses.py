@@ -632,14 +632,25 @@ class UcasCourseClient:
         self.sess.mount("https://", adapter)
         self.sess.mount("http://", adapter)
 
+        # `delay` is the minimum gap between request starts rather than a sleep after every
+        # response, so time spent parsing / writing the previous page counts towards it
+        self._next_request_at = 0.0
+
     # ------------- HTTP helpers -------------
 
-    def soup(self, url: str) -> BeautifulSoup:
-        """GET a page and return BeautifulSoup."""
+    def _get(self, url: str) -> requests.Response:
+        """Paced GET (no parsing)."""
+        wait = self._next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_request_at = time.monotonic() + self.delay
         resp = self.sess.get(url, timeout=self.timeout)
         resp.raise_for_status()
-        time.sleep(self.delay)
-        return BeautifulSoup(resp.text, "lxml")
+        return resp
+
+    def soup(self, url: str) -> BeautifulSoup:
+        """GET a page and return BeautifulSoup."""
+        return BeautifulSoup(self._get(url).text, "lxml")
 
     def build_results_url(self, search_term: str, page_number: int = 1) -> str:
         """Build the `results/courses` URL from a search term."""
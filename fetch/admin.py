@@ -1,20 +1,41 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Exists, OuterRef
 from django.utils.html import format_html
 
 from fetch.models import CareerJob, JobScrapeLog, CareerEmbedding
 
 
+class OnlyColumnsChangeList(ChangeList):
+    """
+    Changelist rows load only the admin's `changelist_only` columns, not the long text
+    fields nobody sees in the list. The change form still gets whole rows: deferring
+    there would cost one extra query per deferred field.
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.only(*self.model_admin.changelist_only)
+
+
 @admin.register(JobScrapeLog)
 class JobScrapeLogAdmin(admin.ModelAdmin):
+    list_per_page = 50
     list_display = ("created_at", "run_id", "status", "route", "sub_type", "job_slug")
+    # list_display columns (no job_url / message)
+    changelist_only = ("id", "created_at", "run_id", "status", "route", "sub_type", "job_slug")
     list_filter = ("status", "route")
     search_fields = ("run_id", "sub_type", "job_slug", "job_url", "message")
     ordering = ("-created_at",)
     readonly_fields = ("created_at",)
 
+    def get_changelist(self, request, **kwargs):
+        return OnlyColumnsChangeList
+
 
 @admin.register(CareerJob)
 class CareerJobAdmin(admin.ModelAdmin):
+    list_per_page = 50
     list_display = (
         "career_type",
         "sub_type",
@@ -29,6 +50,21 @@ class CareerJobAdmin(admin.ModelAdmin):
         "last_scrape_status",
         "last_checked_at",
     )
+    # what list_display (and __str__) read; job_description / how_to_become / ... stay unloaded
+    changelist_only = (
+        "id",
+        "career_type",
+        "sub_type",
+        "normalized_sub_type",
+        "jobname",
+        "salary",
+        "hours",
+        "image_url",
+        "dg_image_url",
+        "scraped_at",
+        "last_scrape_status",
+        "last_checked_at",
+    )
     search_fields = ("jobname", "sub_type","normalized_sub_type", "job_slug", "job_url", "image_url", "dg_image_url")
     list_filter = ("career_type", "sub_type", "normalized_sub_type", "last_scrape_status")
     readonly_fields = (
@@ -71,6 +107,14 @@ class CareerJobAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        # one EXISTS per row inside the page query, instead of a SELECT per row for has_embedding
+        has_embedding = CareerEmbedding.objects.filter(career_id=OuterRef("pk"))
+        return super().get_queryset(request).annotate(_has_embedding=Exists(has_embedding))
+
+    def get_changelist(self, request, **kwargs):
+        return OnlyColumnsChangeList
+
     def _display_image_url(self, obj: CareerJob) -> str:
         dg = (getattr(obj, "dg_image_url", "") or "").strip()
         if dg:
@@ -78,6 +122,10 @@ class CareerJobAdmin(admin.ModelAdmin):
         return (getattr(obj, "image_url", "") or "").strip()
 
     def has_embedding(self, obj: CareerJob):
+        # `_has_embedding` is annotated by get_queryset; unsaved instances (add form) don't carry it
+        annotated = getattr(obj, "_has_embedding", None)
+        if annotated is not None:
+            return annotated
         return hasattr(obj, "embedding_record")
 
     has_embedding.boolean = True
@@ -136,6 +184,10 @@ class CareerEmbeddingAdmin(admin.ModelAdmin):
         "source_text",
     )
     list_filter = ("model_name", "career__career_type", "career__sub_type")
+    # career_type / sub_type read obj.career too; spelled out so they keep the join
+    # even if the career column itself leaves list_display
+    list_select_related = ("career",)
+    list_per_page = 50
     readonly_fields = ("updated_at", "source_text", "embedding_dimension")
     exclude = ("embedding",)
     autocomplete_fields = ("career",)
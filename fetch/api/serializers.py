@@ -1,7 +1,12 @@
 # careers/serializers.py
+from copy import copy
+
 from rest_framework import serializers
 from fetch.models import CareerJob
 
+# built once; validate() only needs a membership test
+_CAREER_TYPE_VALUES = frozenset(CareerJob.CareerType.values)
+
 
 class CareerJobSerializer(serializers.ModelSerializer):
     # optional: show human-readable career type too
@@ -30,13 +35,24 @@ class CareerJobSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "scraped_at", "career_type_display"]
 
+    # ModelSerializer rebuilds every field from model introspection on each
+    # instantiation; build them once per class and hand out shallow copies
+    # (bind() sets parent/field_name on the copy, not the cached field)
+    _fields_cache = None
+
+    def get_fields(self):
+        cls = type(self)
+        if cls.__dict__.get("_fields_cache") is None:
+            cls._fields_cache = super().get_fields()
+        return {name: copy(field) for name, field in cls._fields_cache.items()}
+
     def validate(self, attrs):
         # basic safety checks (optional)
         career_type = attrs.get("career_type", getattr(self.instance, "career_type", None))
         sub_type = attrs.get("sub_type", getattr(self.instance, "sub_type", None))
         job_slug = attrs.get("job_slug", getattr(self.instance, "job_slug", None))
 
-        if career_type and career_type not in dict(CareerJob.CareerType.choices):
+        if career_type and career_type not in _CAREER_TYPE_VALUES:
             raise serializers.ValidationError({"career_type": "Invalid career_type."})
 
         if not sub_type:
@@ -2,16 +2,42 @@
 
 from __future__ import annotations
 
+import itertools
 import uuid
+from collections import deque
+from datetime import timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
 
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from django.db import transaction
 from django.utils import timezone
 
 from fetch.models import CareerJob, JobScrapeLog
-from fetch.scrapper.ncs import NcsClient
+from fetch.scrapper.ncs import ListedJob, NcsClient
 from fetch.services.image_job import generate_fetch_job_image_and_upload
 
+# JobScrapeLog rows are buffered and bulk-inserted instead of one INSERT per job
+LOG_BATCH_SIZE = 500
+
+# parsed profiles are kept in the Django cache (settings.CACHES) between runs
+PROFILE_CACHE_KEY = "ncs:profile:{slug}"
+
+# CareerJob columns filled from a job profile; _upsert_smart compares these to decide "updated"
+PROFILE_FIELDS = (
+    "job_url",
+    "jobname",
+    "job_description",
+    "salary",
+    "hours",
+    "timings",
+    "how_to_become",
+    "college",
+    "college_entry_req",
+    "apprenticeship",
+    "apprenticeship_entry_req",
+)
+
 
 class Command(BaseCommand):
     help = "Scrape NCS Explore Careers and store jobs; also writes DB log history (JobScrapeLog)."
@@ -21,13 +47,146 @@ class Command(BaseCommand):
         parser.add_argument("--limit", type=int, default=0, help="Limit jobs per subtype (0 = no limit).")
         parser.add_argument("--max-rows", type=int, default=0, help="Stop after created+updated reaches this many (0 = no limit).")
         parser.add_argument("--route", type=str, choices=["category", "sector", "both"], default="both")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Job profile pages fetched concurrently (DB writes stay on the main thread).",
+        )
+        parser.add_argument(
+            "--profile-cache-ttl",
+            type=int,
+            default=24 * 3600,
+            help="Seconds a scraped job profile is reused by later runs (0 = don't cache).",
+        )
+        parser.add_argument(
+            "--force-refresh",
+            action="store_true",
+            help="Re-fetch every job profile, ignoring profiles cached by earlier runs and --freshness-hours.",
+        )
+        parser.add_argument(
+            "--freshness-hours",
+            type=float,
+            default=0,
+            help="Skip jobs (no fetch, no DB write) whose row was checked within this many hours (0 = off).",
+        )
 
         # ✅ NEW (optional): images
         parser.add_argument("--no-images", action="store_true", help="Skip Gemini image generation + Cloudinary upload.")
         parser.add_argument("--refresh-images", action="store_true", help="Regenerate image even if image_url already exists.")
+        parser.add_argument(
+            "--image-workers",
+            type=int,
+            default=4,
+            help="Images generated/uploaded in the background while scraping continues.",
+        )
 
     def handle(self, *args, **opts):
-        client = NcsClient(delay=float(opts["delay"]))
+        self._log_buffer: list[JobScrapeLog] = []
+        self._workers = max(1, int(opts.get("workers") or 1))
+        self._profile_ttl = max(0, int(opts.get("profile_cache_ttl") or 0))
+        self._force_refresh = bool(opts.get("force_refresh"))
+        self._freshness_hours = max(0.0, float(opts.get("freshness_hours") or 0))
+        # slugs whose profile is already in the Django cache (read from it or stored this run)
+        self._stored_profiles: set[str] = set()
+        # +1 connection for the listing pages fetched on the main thread
+        client = NcsClient(delay=float(opts["delay"]), pool_size=self._workers + 1)
+        self._pool = ThreadPoolExecutor(max_workers=self._workers)
+        self._image_pool = ThreadPoolExecutor(max_workers=max(1, int(opts.get("image_workers") or 1)))
+        self._image_jobs: list[tuple[Future, dict]] = []
+        try:
+            self._run(opts, client)
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            # normal runs have already drained; this only matters on an aborted run
+            self._image_pool.shutdown(wait=True, cancel_futures=True)
+            self._drain_images(wait=True)
+            # also on an aborted run, so the rows logged so far are kept
+            self._flush_logs()
+            client.close()
+
+    def _prefetch_profiles(
+        self,
+        client: NcsClient,
+        jobs: Iterable[ListedJob],
+        profile_cache: dict[str, Future],
+    ) -> Iterator[tuple[ListedJob, Future]]:
+        """
+        Yield (job, profile_future) in listing order while keeping up to --workers
+        profile pages in flight. Only HTTP + parsing run in the pool. A slug already
+        fetched this run (listed under another category/sector) reuses its future, and
+        one cached by an earlier run (within --profile-cache-ttl) isn't fetched at all.
+        """
+        pending: deque[tuple[ListedJob, Future]] = deque()
+        try:
+            for j in jobs:
+                fut = profile_cache.get(j.slug)
+                if fut is None:
+                    fut = profile_cache[j.slug] = self._cached_profile(j.slug) or self._pool.submit(
+                        client.scrape_job_profile, j.url
+                    )
+                pending.append((j, fut))
+                if len(pending) >= self._workers:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            # consumer stopped early (--max-rows): drop fetches nobody will read
+            for j, fut in pending:
+                if fut.cancel():
+                    profile_cache.pop(j.slug, None)
+
+    @staticmethod
+    def _existing_rows(career_type, sub_type: str, jobs: list[ListedJob]) -> dict[str, dict]:
+        """
+        job_slug -> existing row for a whole subtype listing, in one query instead of
+        one per job. Rows hold the columns _upsert_smart compares and the image step reads.
+        """
+        if not jobs:
+            return {}
+        rows = CareerJob.objects.filter(
+            career_type=career_type,
+            sub_type=sub_type,
+            job_slug__in={j.slug for j in jobs},
+        ).values("id", "career_type", "sub_type", "job_slug", *PROFILE_FIELDS, "image_url", "last_checked_at")
+        return {row["job_slug"]: row for row in rows}
+
+    def _fresh_slugs(self, rows: dict[str, dict]) -> set[str]:
+        """Slugs whose row was last checked within --freshness-hours."""
+        if self._force_refresh or not self._freshness_hours:
+            return set()
+        since = timezone.now() - timedelta(hours=self._freshness_hours)
+        return {
+            slug for slug, row in rows.items()
+            if row["last_checked_at"] is not None and row["last_checked_at"] >= since
+        }
+
+    def _cached_profile(self, slug: str) -> Future | None:
+        """A completed future holding slug's profile from an earlier run, or None."""
+        if self._force_refresh or not self._profile_ttl:
+            return None
+        details = cache.get(PROFILE_CACHE_KEY.format(slug=slug))
+        if details is None:
+            return None
+        self._stored_profiles.add(slug)
+        fut: Future = Future()
+        fut.set_result(details)
+        return fut
+
+    def _profile(self, j: ListedJob, fut: Future, profile_cache: dict[str, Future]) -> dict:
+        try:
+            details = fut.result()
+        except Exception:
+            # failures aren't cached: the slug is fetched again if it shows up elsewhere
+            if profile_cache.get(j.slug) is fut:
+                del profile_cache[j.slug]
+            raise
+        if self._profile_ttl and j.slug not in self._stored_profiles:
+            cache.set(PROFILE_CACHE_KEY.format(slug=j.slug), details, timeout=self._profile_ttl)
+            self._stored_profiles.add(j.slug)
+        return details
+
+    def _run(self, opts: dict, client: NcsClient) -> None:
         per_subtype_limit = int(opts["limit"])
         max_rows = int(opts["max_rows"])
         route = opts["route"]
@@ -38,7 +197,8 @@ class Command(BaseCommand):
         run_id = uuid.uuid4()
         self.stdout.write(self.style.WARNING(f"run_id={run_id}"))
 
-        profile_cache: dict[str, dict] = {}
+        # slug -> profile fetch (done or in flight), shared by both routes
+        profile_cache: dict[str, Future] = {}
 
         processed = 0
         created_count = 0
@@ -49,32 +209,29 @@ class Command(BaseCommand):
         def should_stop() -> bool:
             return (max_rows > 0) and ((created_count + updated_count) >= max_rows)
 
-        def _maybe_generate_image(obj: CareerJob):
-            # model must have image_url field
-            if not hasattr(obj, "image_url"):
-                return
+        def _maybe_generate_image(row: dict, log_ctx: dict):
+            # row: the columns _upsert_smart read/wrote, no second SELECT
             if no_images:
                 return
 
-            existing = (getattr(obj, "image_url", "") or "").strip()
+            existing = (row["image_url"] or "").strip()
             if existing and not refresh_images:
                 return
 
-            jobname = (obj.jobname or "").strip()
+            jobname = (row["jobname"] or "").strip()
             if not jobname:
                 return
 
-            cloud_url, _prompt_used = generate_fetch_job_image_and_upload(
-                career_type=str(obj.career_type),
-                sub_type=str(obj.sub_type),
-                job_slug=str(obj.job_slug),
+            # Gemini + Cloudinary run in the background; _drain_images writes the URL
+            fut = self._image_pool.submit(
+                generate_fetch_job_image_and_upload,
+                career_type=str(row["career_type"]),
+                sub_type=str(row["sub_type"]),
+                job_slug=str(row["job_slug"]),
                 jobname=jobname,
                 folder="ncs_careers",
             )
-            cloud_url = (cloud_url or "").strip()
-            if cloud_url and cloud_url != existing:
-                obj.image_url = cloud_url
-                obj.save(update_fields=["image_url"])
+            self._image_jobs.append((fut, {"pk": row["id"], "existing_url": existing, "log_ctx": log_ctx}))
 
         # -------- CATEGORIES ROUTE --------
         if route in ("category", "both"):
@@ -86,50 +243,60 @@ class Command(BaseCommand):
                     break
 
                 self.stdout.write(f"[CATEGORY] {cat_name} ({cat_slug})")
-                count = 0
+                jobs = (j for j in client.iter_category_jobs(cat_slug) if j.slug)
+                jobs = list(itertools.islice(jobs, per_subtype_limit or None))
+
+                rows = self._existing_rows(CareerJob.CareerType.CATEGORY, cat_name, jobs)
+                fresh = self._fresh_slugs(rows)
+                if fresh:
+                    for j in jobs:
+                        if j.slug in fresh:
+                            processed += 1
+                            skipped_count += 1
+                            self._log(
+                                run_id=run_id,
+                                route="category",
+                                sub_type=cat_name,
+                                job_slug=j.slug,
+                                job_url=j.url,
+                                status="skipped",
+                                message="fresh",
+                            )
+                    self.stdout.write(f"  {len(fresh)} job(s) checked within {self._freshness_hours:g}h -> skipped")
+                    jobs = [j for j in jobs if j.slug not in fresh]
 
-                for j in client.iter_category_jobs(cat_slug):
+                for j, profile_future in self._prefetch_profiles(client, jobs, profile_cache):
                     if should_stop():
                         break
-                    if per_subtype_limit and count >= per_subtype_limit:
-                        break
-                    if not j.slug:
-                        continue
 
-                    count += 1
                     processed += 1
 
                     try:
-                        details = profile_cache.get(j.slug)
-                        if not details:
-                            details = client.scrape_job_profile(j.url)
-                            profile_cache[j.slug] = details
+                        details = self._profile(j, profile_future, profile_cache)
 
-                        status, obj = self._upsert_smart(
+                        status, row = self._upsert_smart(
                             career_type=CareerJob.CareerType.CATEGORY,
                             sub_type=cat_name,
                             job_slug=j.slug,
                             job_url=j.url,
                             details=details,
                             run_id=run_id,
+                            existing=rows.get(j.slug),
                         )
+                        # a slug listed twice in the subtype now finds the row just written
+                        rows[j.slug] = row
 
                         # ✅ image generation (does NOT affect status)
-                        try:
-                            _maybe_generate_image(obj)
-                        except Exception as e:
-                            error_count += 1
-                            JobScrapeLog.objects.create(
-                                run_id=run_id,
-                                route="category",
-                                sub_type=cat_name,
-                                job_slug=j.slug,
-                                job_url=j.url,
-                                status="image_error",
-                                message=str(e),
-                            )
-
-                        JobScrapeLog.objects.create(
+                        _maybe_generate_image(row, {
+                            "run_id": run_id,
+                            "route": "category",
+                            "sub_type": cat_name,
+                            "job_slug": j.slug,
+                            "job_url": j.url,
+                        })
+                        error_count += self._drain_images(wait=False)
+
+                        self._log(
                             run_id=run_id,
                             route="category",
                             sub_type=cat_name,
@@ -153,7 +320,7 @@ class Command(BaseCommand):
 
                     except Exception as e:
                         error_count += 1
-                        JobScrapeLog.objects.create(
+                        self._log(
                             run_id=run_id,
                             route="category",
                             sub_type=cat_name,
@@ -163,6 +330,8 @@ class Command(BaseCommand):
                             message=str(e),
                         )
 
+                self._flush_logs()
+
         # -------- SECTORS ROUTE --------
         if route in ("sector", "both") and not should_stop():
             sectors = client.get_sectors()
@@ -173,50 +342,60 @@ class Command(BaseCommand):
                     break
 
                 self.stdout.write(f"[SECTOR] {sec_name} ({sec_slug})")
-                count = 0
+                jobs = (j for j in client.iter_sector_jobs(sec_slug) if j.slug)
+                jobs = list(itertools.islice(jobs, per_subtype_limit or None))
+
+                rows = self._existing_rows(CareerJob.CareerType.SECTOR, sec_name, jobs)
+                fresh = self._fresh_slugs(rows)
+                if fresh:
+                    for j in jobs:
+                        if j.slug in fresh:
+                            processed += 1
+                            skipped_count += 1
+                            self._log(
+                                run_id=run_id,
+                                route="sector",
+                                sub_type=sec_name,
+                                job_slug=j.slug,
+                                job_url=j.url,
+                                status="skipped",
+                                message="fresh",
+                            )
+                    self.stdout.write(f"  {len(fresh)} job(s) checked within {self._freshness_hours:g}h -> skipped")
+                    jobs = [j for j in jobs if j.slug not in fresh]
 
-                for j in client.iter_sector_jobs(sec_slug):
+                for j, profile_future in self._prefetch_profiles(client, jobs, profile_cache):
                     if should_stop():
                         break
-                    if per_subtype_limit and count >= per_subtype_limit:
-                        break
-                    if not j.slug:
-                        continue
 
-                    count += 1
                     processed += 1
 
                     try:
-                        details = profile_cache.get(j.slug)
-                        if not details:
-                            details = client.scrape_job_profile(j.url)
-                            profile_cache[j.slug] = details
+                        details = self._profile(j, profile_future, profile_cache)
 
-                        status, obj = self._upsert_smart(
+                        status, row = self._upsert_smart(
                             career_type=CareerJob.CareerType.SECTOR,
                             sub_type=sec_name,
                             job_slug=j.slug,
                             job_url=j.url,
                             details=details,
                             run_id=run_id,
+                            existing=rows.get(j.slug),
                         )
+                        # a slug listed twice in the subtype now finds the row just written
+                        rows[j.slug] = row
 
                         # ✅ image generation (does NOT affect status)
-                        try:
-                            _maybe_generate_image(obj)
-                        except Exception as e:
-                            error_count += 1
-                            JobScrapeLog.objects.create(
-                                run_id=run_id,
-                                route="sector",
-                                sub_type=sec_name,
-                                job_slug=j.slug,
-                                job_url=j.url,
-                                status="image_error",
-                                message=str(e),
-                            )
-
-                        JobScrapeLog.objects.create(
+                        _maybe_generate_image(row, {
+                            "run_id": run_id,
+                            "route": "sector",
+                            "sub_type": sec_name,
+                            "job_slug": j.slug,
+                            "job_url": j.url,
+                        })
+                        error_count += self._drain_images(wait=False)
+
+                        self._log(
                             run_id=run_id,
                             route="sector",
                             sub_type=sec_name,
@@ -240,7 +419,7 @@ class Command(BaseCommand):
 
                     except Exception as e:
                         error_count += 1
-                        JobScrapeLog.objects.create(
+                        self._log(
                             run_id=run_id,
                             route="sector",
                             sub_type=sec_name,
@@ -250,12 +429,54 @@ class Command(BaseCommand):
                             message=str(e),
                         )
 
+                self._flush_logs()
+
+        error_count += self._drain_images(wait=True)
         self.stdout.write(self.style.SUCCESS(
             f"Done. run_id={run_id} created={created_count}, updated={updated_count}, skipped={skipped_count}, error={error_count}"
         ))
 
-    @transaction.atomic
-    def _upsert_smart(self, *, career_type, sub_type, job_slug, job_url, details, run_id) -> tuple[str, CareerJob]:
+    def _drain_images(self, *, wait: bool) -> int:
+        """
+        Store finished image uploads (main thread only). wait=True blocks on all pending jobs.
+        Returns how many of the drained jobs failed.
+        """
+        failed = 0
+        pending: list[tuple[Future, dict]] = []
+        for fut, job in self._image_jobs:
+            if fut.cancelled():
+                continue
+            if not (wait or fut.done()):
+                pending.append((fut, job))
+                continue
+            try:
+                cloud_url, _prompt_used = fut.result()
+                cloud_url = (cloud_url or "").strip()
+                if cloud_url and cloud_url != job["existing_url"]:
+                    CareerJob.objects.filter(pk=job["pk"]).update(image_url=cloud_url)
+            except Exception as e:
+                failed += 1
+                self._log(**job["log_ctx"], status="image_error", message=str(e))
+        self._image_jobs = pending
+        return failed
+
+    def _log(self, **fields) -> None:
+        self._log_buffer.append(JobScrapeLog(**fields))
+        if len(self._log_buffer) >= LOG_BATCH_SIZE:
+            self._flush_logs()
+
+    def _flush_logs(self) -> None:
+        if self._log_buffer:
+            JobScrapeLog.objects.bulk_create(self._log_buffer, batch_size=LOG_BATCH_SIZE)
+            self._log_buffer.clear()
+
+    def _upsert_smart(
+        self, *, career_type, sub_type, job_slug, job_url, details, run_id, existing: dict | None
+    ) -> tuple[str, dict]:
+        """
+        existing: the job's row from _existing_rows, or None if there is none yet.
+        Returns (status, row); row has the same columns, updated to what was written.
+        """
         now = timezone.now()
 
         new_vals = {
@@ -270,52 +491,54 @@ class Command(BaseCommand):
             "college_entry_req": details.get("college_entry_req") or "",
             "apprenticeship": details.get("apprenticeship") or "",
             "apprenticeship_entry_req": details.get("apprenticeship_entry_req") or "",
-
-            # ✅ keep your logging columns fresh (does not change status logic)
+        }
+        # ✅ keep your logging columns fresh (does not change status logic)
+        meta = {
             "last_checked_at": now,
             "last_scrape_run_id": run_id,
         }
-
-        obj, created = CareerJob.objects.get_or_create(
-            career_type=career_type,
-            sub_type=sub_type,
-            job_slug=job_slug,
-            defaults=new_vals,
+        key = {"career_type": career_type, "sub_type": sub_type, "job_slug": job_slug}
+
+        # Not INSERT ... ON CONFLICT (bulk_create(update_conflicts=True) on the
+        # fetch_careerjob_type_sub_slug_uniq index from 0005): the run needs a per-row
+        # created/updated/skipped status and its changed_fields message, skipped rows
+        # must not rewrite their content columns, and the image step needs the pk.
+        # The existence check is already one query per subtype (_existing_rows), so
+        # an upsert would only save the branch, not a round trip.
+        if existing is None:
+            # create() so save() fills normalized_sub_type
+            obj = CareerJob.objects.create(
+                **key,
+                **new_vals,
+                **meta,
+                last_scrape_status="created",
+                last_scrape_message="",
+            )
+            return "created", {
+                "id": obj.pk,
+                **key,
+                **new_vals,
+                "image_url": obj.image_url,
+                "last_checked_at": now,
+            }
+
+        changed = {field: val for field, val in new_vals.items() if existing[field] != val}
+        jobs = CareerJob.objects.filter(pk=existing["id"])
+        existing["last_checked_at"] = now
+
+        if not changed:
+            jobs.update(**meta, last_scrape_status="skipped", last_scrape_message="")
+            return "skipped", existing
+
+        msg = f"changed_fields={','.join(changed)}"
+        # .update() skips auto_now, so scraped_at is set here as save() used to;
+        # sub_type is part of the lookup, so normalized_sub_type can't have changed
+        jobs.update(
+            **changed,
+            **meta,
+            scraped_at=now,
+            last_scrape_status="updated",
+            last_scrape_message=msg,
         )
-
-        if created:
-            obj.last_scrape_status = "created"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=["last_scrape_status", "last_scrape_message"])
-            return "created", obj
-
-        changed_fields: list[str] = []
-
-        for field, val in new_vals.items():
-            if field in ("last_checked_at", "last_scrape_run_id"):
-                continue
-            if getattr(obj, field) != val:
-                setattr(obj, field, val)
-                changed_fields.append(field)
-
-        obj.last_checked_at = now
-        obj.last_scrape_run_id = run_id
-
-        if not changed_fields:
-            obj.last_scrape_status = "skipped"
-            obj.last_scrape_message = ""
-            obj.save(update_fields=["last_checked_at", "last_scrape_run_id", "last_scrape_status", "last_scrape_message"])
-            return "skipped", obj
-
-        msg = f"changed_fields={','.join(changed_fields)}"
-        obj.last_scrape_status = "updated"
-        obj.last_scrape_message = msg
-
-        obj.save(update_fields=changed_fields + [
-            "scraped_at",
-            "last_checked_at",
-            "last_scrape_run_id",
-            "last_scrape_status",
-            "last_scrape_message",
-        ])
-        return "updated", obj
+        existing.update(changed)
+        return "updated", existing
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # REQUIRED for CREATE INDEX CONCURRENTLY
+
+    dependencies = [
+        ('fetch', '0010_careerjob_normalized_sub_type'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='careerjob',
+            index=models.Index(fields=['last_scrape_run_id', 'last_scrape_status'], name='careerjob_run_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='careerjob',
+            index=models.Index(fields=['last_scrape_status', 'career_type', 'sub_type'], name='careerjob_status_type_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='careerjob',
+            index=models.Index(fields=['-scraped_at'], name='careerjob_scraped_desc_idx'),
+        ),
+    ]
@@ -76,6 +76,17 @@ class CareerJob(models.Model):
 
     # class Meta:
     #     # unique_together = ("career_type", "sub_type", "job_slug")
+    # (the scrape's (career_type, sub_type, job_slug) lookup uses the unique index from 0005)
+
+    class Meta:
+        indexes = [
+            # run-level reporting: rows (and their status) touched by one scrape run
+            models.Index(fields=["last_scrape_run_id", "last_scrape_status"], name="careerjob_run_status_idx"),
+            # admin filters: status alone or with career type / sub type
+            models.Index(fields=["last_scrape_status", "career_type", "sub_type"], name="careerjob_status_type_idx"),
+            # newest-first listings (admin "scraped at" column sort)
+            models.Index(fields=["-scraped_at"], name="careerjob_scraped_desc_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         self.normalized_sub_type = normalize_sub_type(self.sub_type)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+import threading
 import time
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
@@ -8,6 +9,7 @@ from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
 
 
 BASE = "https://nationalcareers.service.gov.uk"
@@ -52,7 +54,7 @@ class NcsClient:
       - Separates college_entry_req and apprenticeship_entry_req
     """
 
-    def __init__(self, *, delay: float = 0.5, timeout: int = 30) -> None:
+    def __init__(self, *, delay: float = 0.5, timeout: int = 30, pool_size: int = 10) -> None:
         self.delay = delay
         self.timeout = timeout
         self.sess = requests.Session()
@@ -60,10 +62,31 @@ class NcsClient:
             {"User-Agent": "Mozilla/5.0 (compatible; DjangoScraper/1.0)"}
         )
 
+        # one keep-alive connection per concurrent caller (the scrape command fetches
+        # job profiles in a pool), otherwise urllib3 drops the surplus connections
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.sess.mount("https://", adapter)
+        self.sess.mount("http://", adapter)
+
+        # `delay` is the minimum gap between request starts, shared by every thread using this client
+        self._pace_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _pace(self) -> None:
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.delay
+        if wait > 0:
+            time.sleep(wait)
+
+    def close(self) -> None:
+        self.sess.close()
+
     def soup(self, url: str) -> BeautifulSoup:
+        self._pace()
         r = self.sess.get(url, timeout=self.timeout)
         r.raise_for_status()
-        time.sleep(self.delay)
         return BeautifulSoup(r.text, "lxml")
 
     # ---------- Pagination ----------
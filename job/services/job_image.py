@@ -11,6 +11,9 @@ import cloudinary.uploader
 from google import genai
 from google.genai import types
 
+# once per process instead of on every upload
+cloudinary.config(secure=True)
+
 
 def _prompt_for_title(title: str) -> str:
     title = " ".join((title or "").split())[:220]
@@ -135,12 +138,10 @@ def generate_image_png_bytes(title: str) -> bytes:
 
 
 def upload_png_to_cloudinary(png_bytes: bytes, *, job_id: str) -> str:
-    cloudinary.config(secure=True)
-
-    data_uri = "data:image/png;base64," + base64.b64encode(png_bytes).decode("ascii")
-
+    # Raw bytes as a (filename, data) multipart file rather than a data: URI string:
+    # no base64 copy of the PNG, and Cloudinary has nothing to decode.
     result = cloudinary.uploader.upload(
-        data_uri,
+        (f"dwp_{job_id}.png", png_bytes),
         folder="career-roadmap/jobs",
         public_id=f"dwp_{job_id}",
         overwrite=True,
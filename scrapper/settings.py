@@ -106,6 +106,12 @@ DATABASES = {
     )
 }
 
+# Cache (scrape profiles are reused across runs through it).
+# CACHE_URL takes django-environ cache URLs, e.g. redis://127.0.0.1:6379/1
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default=f"filecache://{BASE_DIR / '.cache' / 'django'}"),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 